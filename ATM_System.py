@@ -1,9 +1,20 @@
 from abc import ABC, abstractmethod
+from array import array
+from collections import namedtuple
 from enum import Enum
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+import itertools
+import os
+import queue
+import threading
 import uuid
 
+# Transaction ids: a per-process random prefix plus a monotonic counter,
+# so the hot debit/credit path avoids a uuid4() call per transaction
+_txn_prefix = uuid.uuid4().hex[:8]
+_txn_counter = itertools.count()
+
 # Enums for better type safety
 class TransactionType(Enum):
     DEPOSIT = "DEPOSIT"
@@ -11,6 +22,16 @@ class TransactionType(Enum):
     BALANCE_INQUIRY = "BALANCE_INQUIRY"
     TRANSFER = "TRANSFER"
 
+def _to_cents(amount: float) -> int:
+    """Convert a dollar amount at the API boundary to integer cents"""
+    return int(round(amount * 100))
+
+# Compact type codes for the columnar transaction history
+_TXN_TYPES = list(TransactionType)
+_TXN_TYPE_CODES = {t: i for i, t in enumerate(_TXN_TYPES)}
+# Pre-resolved enum values, avoiding the Enum .value property on serialization
+_TXN_TYPE_VALUES = {t: t.value for t in TransactionType}
+
 class AccountType(Enum):
     CHECKING = "CHECKING"
     SAVINGS = "SAVINGS"
@@ -20,7 +41,12 @@ class ATMStatus(Enum):
     INACTIVE = "INACTIVE"
     MAINTENANCE = "MAINTENANCE"
 
+# Active ATM session; a tuple is cheaper to build than a dict on every login
+Session = namedtuple('Session', ['account_number', 'start_time'])
+
 class Card:
+    __slots__ = ('card_number', 'account_number', 'expiry_date', 'is_blocked')
+
     def __init__(self, card_number: str, account_number: str, expiry_date: datetime):
         self.card_number = card_number
         self.account_number = account_number
@@ -32,64 +58,161 @@ class Card:
     
 
 class Transaction:
+    __slots__ = ('transaction_id', 'account_number', 'transaction_type', 'amount',
+                 'balance_after', 'timestamp', 'description')
+
     def __init__(self, transaction_id: str, account_number: str, 
                  transaction_type: TransactionType, amount: float, 
-                 balance_after: float, description: str = ""):
+                 balance_after: float, description: str = "",
+                 timestamp: Optional[datetime] = None):
         self.transaction_id = transaction_id
         self.account_number = account_number
         self.transaction_type = transaction_type
         self.amount = amount
         self.balance_after = balance_after
-        self.timestamp = datetime.now()
+        self.timestamp = timestamp or datetime.now()
         self.description = description
 
+    def to_dict(self) -> dict:
+        return {
+            "transaction_id": self.transaction_id,
+            "account_number": self.account_number,
+            "transaction_type": _TXN_TYPE_VALUES[self.transaction_type],
+            "amount": self.amount,
+            "balance_after": self.balance_after,
+            "timestamp": self.timestamp.isoformat(),
+            "description": self.description
+        }
+
+class TransactionWriter:
+    """Appends transactions to a log file from a background thread, one fsync per batch"""
+    def __init__(self, log_path: str, batch_size: int = 100, flush_interval: float = 0.005):
+        self.log_path = log_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, transaction: Transaction) -> threading.Event:
+        """Queue a transaction; the returned event is set once it is on disk"""
+        durable = threading.Event()
+        self._queue.put((transaction, durable))
+        return durable
+
+    def _drain(self) -> list:
+        batch = [self._queue.get()]  # Block until there is work
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        with open(self.log_path, "a") as log:
+            while True:
+                batch = self._drain()
+                log.write("".join(
+                    f"{t.transaction_id}\t{t.account_number}\t{_TXN_TYPE_VALUES[t.transaction_type]}\t"
+                    f"{t.amount}\t{t.balance_after}\t{t.timestamp.isoformat()}\t{t.description}\n"
+                    for t, _ in batch
+                ))
+                log.flush()
+                os.fsync(log.fileno())
+                for _, durable in batch:
+                    durable.set()
+
+    def read_history(self, account_number: str) -> List[Transaction]:
+        """Scan the log for an account's transactions (only those already written)"""
+        history = []
+        try:
+            with open(self.log_path) as log:
+                for line in log:
+                    fields = line.rstrip("\n").split("\t", 6)
+                    if fields[1] != account_number:
+                        continue
+                    history.append(Transaction(
+                        fields[0], fields[1], TransactionType(fields[2]), float(fields[3]),
+                        float(fields[4]), fields[6], datetime.fromisoformat(fields[5])
+                    ))
+        except FileNotFoundError:
+            pass
+        return history
+
 class CashDispenser:
     def __init__(self, initial_cash: float = 50000.0):
-        self.available_cash = initial_cash
-        self.min_cash_threshold = 1000.0
+        # Cash is tracked in integer cents
+        self.available_cash = _to_cents(initial_cash)
+        self.min_cash_threshold = 100000
     
     def dispense_cash(self, amount: float) -> bool:
-        if self.can_dispense(amount):
-            self.available_cash -= amount
+        cents = _to_cents(amount)
+        if self.available_cash >= cents and cents > 0:
+            self.available_cash -= cents
             return True
         return False
     
     def can_dispense(self, amount: float) -> bool:
-        return self.available_cash >= amount and amount > 0
+        cents = _to_cents(amount)
+        return self.available_cash >= cents and cents > 0
     
     def add_cash(self, amount: float):
-        self.available_cash += amount
+        self.available_cash += _to_cents(amount)
     
     def is_low_on_cash(self) -> bool:
         return self.available_cash < self.min_cash_threshold
 
 class Customer:
+    __slots__ = ('customer_id', 'name', 'phone', 'email', 'accounts', 'cards')
+
     def __init__(self, customer_id: str, name: str, phone: str, email: str):
         self.customer_id = customer_id
         self.name = name
         self.phone = phone
         self.email = email
-        self.accounts: List[str] = []  # List of account numbers
+        self.accounts: Set[str] = set()  # Set of account numbers
         self.cards: List[Card] = []
 
     def add_account(self, account_number:str):
-        if account_number not in self.accounts:
-            self.accounts.append(account_number)
+        self.accounts.add(account_number)
 
     def add_cards(self, card: Card):
         self.cards.append(card)
 
 class Account:
+    # Number of recent transactions kept in memory when a writer holds the older ones in its log;
+    # without a writer the whole history stays in memory
+    HISTORY_WINDOW = 256
+
+    __slots__ = ('account_number', 'customer_id', 'account_type', 'account_type_str', 'balance', 'pin',
+                 'is_active', 'daily_withdrawal_limit', 'daily_withdrawn',
+                 '_txn_ids', '_txn_types', '_txn_amounts', '_txn_balances',
+                 '_txn_timestamps', '_txn_descriptions', 'writer', 'version', '_lock')
+
     def __init__(self, account_number: str, customer_id: str, account_type: AccountType, initial_balance: float = 0.0):
         self.account_number = account_number
         self.customer_id = customer_id
         self.account_type = account_type
-        self.balance = initial_balance
+        self.account_type_str = account_type.value  # Cached for responses
+        # Money is held in integer cents; amounts are converted at the API boundary
+        self.balance = _to_cents(initial_balance)
         self.pin = None  # Will be set separately for security
         self.is_active = True
-        self.daily_withdrawal_limit = 1000.0
-        self.daily_withdrawn = 0.0
-        self.transaction_history: List[Transaction] = []
+        self.daily_withdrawal_limit = 100000
+        self.daily_withdrawn = 0
+        # Transaction history is stored column-wise (one array per field)
+        # instead of a list of Transaction objects; see get_history()
+        self._txn_ids: List[str] = []
+        self._txn_types = array('B')
+        self._txn_amounts = array('q')  # Cents
+        self._txn_balances = array('q')  # Cents
+        self._txn_timestamps = array('d')
+        self._txn_descriptions: List[str] = []
+        self.writer: Optional[TransactionWriter] = None  # Set by ATM_System when persisting
+        # Per-account lock around read-modify-write; version is bumped on every change
+        self.version = 0
+        self._lock = threading.RLock()
 
     def set_pin(self, pin:str):
         self.pin = pin
@@ -98,62 +221,128 @@ class Account:
         return self.pin == pin
     
     def can_withdraw(self, amount: float) -> bool:
+        cents = _to_cents(amount)
         return (self.is_active and 
-                self.balance >= amount and 
-                self.daily_withdrawn + amount <= self.daily_withdrawal_limit)
+                self.balance >= cents and 
+                self.daily_withdrawn + cents <= self.daily_withdrawal_limit)
     
-    def debit(self, amount: float, description: str = "") -> Transaction:
-        if not self.can_withdraw(amount):
-            return None  # Simplified - return None if cannot withdraw
-        
-        self.balance -= amount
-        self.daily_withdrawn += amount
-        transaction = Transaction(
-            str(uuid.uuid4()), self.account_number, 
-            TransactionType.WITHDRAW, amount, self.balance, description
-        )
-        self.transaction_history.append(transaction)
+    def debit(self, amount: float, description: str = "", now: Optional[datetime] = None) -> Transaction:
+        with self._lock:
+            # Same check as can_withdraw(), fused with the update so each field is read once
+            cents = _to_cents(amount)
+            new_balance = self.balance - cents
+            new_daily_withdrawn = self.daily_withdrawn + cents
+            if not self.is_active or new_balance < 0 or new_daily_withdrawn > self.daily_withdrawal_limit:
+                return None  # Simplified - return None if cannot withdraw
+            
+            self.balance = new_balance
+            self.daily_withdrawn = new_daily_withdrawn
+            self.version += 1
+            transaction = Transaction(
+                f"{_txn_prefix}-{next(_txn_counter):012x}", self.account_number, 
+                TransactionType.WITHDRAW, amount, self.balance / 100, description, now
+            )
+            self._record(transaction, cents)
         return transaction
     
-    def credit(self, amount: float, description: str = "") -> Transaction:
-        if not self.is_active:
-            return None 
-        
-        self.balance += amount
-        transaction = Transaction(
-            str(uuid.uuid4()), self.account_number, 
-            TransactionType.DEPOSIT, amount, self.balance, description
-        )
-        self.transaction_history.append(transaction)
+    def credit(self, amount: float, description: str = "", now: Optional[datetime] = None) -> Transaction:
+        with self._lock:
+            if not self.is_active:
+                return None 
+            
+            cents = _to_cents(amount)
+            self.balance += cents
+            self.version += 1
+            transaction = Transaction(
+                f"{_txn_prefix}-{next(_txn_counter):012x}", self.account_number, 
+                TransactionType.DEPOSIT, amount, self.balance / 100, description, now
+            )
+            self._record(transaction, cents)
         return transaction
     
+    def update(self, callback):
+        """Apply callback(balance, daily_withdrawn) -> (new_balance, new_daily_withdrawn),
+        all in cents, retrying if the account changed while the callback ran"""
+        while True:
+            expected = self.version
+            new_balance, new_daily_withdrawn = callback(self.balance, self.daily_withdrawn)
+            with self._lock:
+                if self.version == expected:
+                    self.balance = new_balance
+                    self.daily_withdrawn = new_daily_withdrawn
+                    self.version += 1
+                    return
+    
+    def _record(self, transaction: Transaction, amount_cents: int):
+        self._txn_ids.append(transaction.transaction_id)
+        self._txn_types.append(_TXN_TYPE_CODES[transaction.transaction_type])
+        self._txn_amounts.append(amount_cents)
+        self._txn_balances.append(self.balance)
+        self._txn_timestamps.append(transaction.timestamp.timestamp())
+        self._txn_descriptions.append(transaction.description)
+        if not self.writer:
+            return  # Nothing else keeps the history, so keep all of it
+        self.writer.submit(transaction)
+        # Trim back to the window once the columns reach twice its size, so
+        # memory stays bounded and the trimming cost is amortised per append
+        excess = len(self._txn_ids) - self.HISTORY_WINDOW
+        if excess >= self.HISTORY_WINDOW:
+            for column in (self._txn_ids, self._txn_types, self._txn_amounts,
+                           self._txn_balances, self._txn_timestamps, self._txn_descriptions):
+                del column[:excess]
+    
+    def get_history(self, full: bool = False) -> List[Transaction]:
+        """Rebuild Transaction objects from the history columns; these hold everything unless
+        a writer is attached, in which case full=True reads the whole history back from its log"""
+        if full and self.writer:
+            return self.writer.read_history(self.account_number)
+        history = []
+        for i in range(len(self._txn_ids)):
+            transaction = Transaction(
+                self._txn_ids[i], self.account_number, _TXN_TYPES[self._txn_types[i]],
+                self._txn_amounts[i] / 100, self._txn_balances[i] / 100, self._txn_descriptions[i],
+                datetime.fromtimestamp(self._txn_timestamps[i])
+            )
+            history.append(transaction)
+        return history
+    
     def get_balance(self) -> float:
-        return self.balance
+        return self.balance / 100
     
     def reset_daily_limit(self):
         # This should be called daily
-        self.daily_withdrawn = 0.0
+        self.daily_withdrawn = 0
 
 
 class Request(ABC):
+    __slots__ = ('account_number', 'amount', 'timestamp')
+
     def __init__(self, account_number:str, amount: float=0.0):
         self.account_number = account_number
         self.amount = amount
-        self.timestamp = Date.now()
+        self.timestamp = datetime.now()
 
 class DepositRequest(Request):
+    __slots__ = ()
+
     def __init__(self, account_number: str, amount: float):
         super().__init__(account_number, amount)
 
 class WithdrawRequest(Request):
+    __slots__ = ()
+
     def __init__(self, account_number: str, amount: float):
         super().__init__(account_number, amount)
 
 class CheckBalanceRequest(Request):
+    __slots__ = ()
+
     def __init__(self, account_number: str):
         super().__init__(account_number)
 
 class AccountTransferRequest(Request):
+    __slots__ = ('to_account',)
+
     def __init__(self, from_account: str, to_account: str, amount: float):
         super().__init__(from_account, amount)
         self.to_account = to_account
@@ -167,27 +356,32 @@ class ATM:
         self.current_session = None
         self.failed_attempts = 0
         self.max_failed_attempts = 3
+        # Request type -> handler, so dispatch is a single dict lookup
+        self._handlers = {
+            DepositRequest: self._handle_deposit,
+            WithdrawRequest: self._handle_withdraw,
+            CheckBalanceRequest: self._handle_balance_inquiry,
+            AccountTransferRequest: self._handle_transfer,
+        }
 
     def is_operational(self) -> bool:
         return (self.status == ATMStatus.ACTIVE and not self.cash_dispenser.is_low_on_cash())
     
-    def authenticate_card(self, card: Card, pin:str, atm_system: ATM_System) -> bool:
-        if not card.is_valid:
+    def authenticate_card(self, card: Card, pin:str, atm_system: 'ATM_System') -> bool:
+        if not card.is_valid():
             return False
 
         account = atm_system.get_account_by_card(card.card_number)
-        if account and account.verify(pin):
+        if account and account.verify_pin(pin):
             self.failed_attempts = 0
-            self.current_session = {
-                "account_number": account.account_number,
-                "start_time": datetime.now()
-            }
+            self.current_session = Session(account.account_number, datetime.now())
             return True
-        else:
-            self.failed_attempts += 1
-            if self.failed_attempts > self.max_failed_attempts:
-                card.is_blocked = True
-            return False
+
+        attempts = self.failed_attempts + 1
+        self.failed_attempts = attempts
+        if attempts > self.max_failed_attempts:
+            card.is_blocked = True
+        return False
         
     def end_session(self):
         self.current_session = None
@@ -199,39 +393,35 @@ class ATM:
             return {"success": False, "message": "ATM is currently unavailable"}
         
         # Route to appropriate handler based on request type
-        if isinstance(request, DepositRequest):
-            return self._handle_deposit(request, atm_system)
-        elif isinstance(request, WithdrawRequest):
-            return self._handle_withdrawal(request, atm_system)
-        elif isinstance(request, CheckBalanceRequest):
-            return self._handle_balance_inquiry(request, atm_system)
-        elif isinstance(request, AccountTransferRequest):
-            return self._handle_transfer(request, atm_system)
-        else:
+        handler = self._handlers.get(type(request))
+        if handler is None:
             return {"success": False, "message": "Unsupported request type"}
+        # One clock read per request, shared by every transaction it creates
+        return handler(request, atm_system, datetime.now())
         
-    def _handle_deposit(self, request, atm_system):
+    def _handle_deposit(self, request, atm_system, now: datetime):
         account = atm_system.get_account(request.account_number)
         if not account:
             return {"success": False, "message": "Account not found"}
         
-        transaction = account.credit(request.amount, "ATM Deposit")
+        transaction = account.credit(request.amount, "ATM Deposit", now)
         if not transaction:
             return {"success": False, "message": "Deposit failed"}
         
         return {
             "success": True,
-            "message": f"Successfully deposited ${request.amount:.2f}",
+            "code": "DEPOSIT_OK",
+            "amount": request.amount,
             "balance": account.get_balance(),
             "transaction_id": transaction.transaction_id
         }
     
-    def _handle_withdraw(self, request, atm_system):
+    def _handle_withdraw(self, request, atm_system, now: datetime):
         account = atm_system.get_account(request.account_number)
         if not account:
             return {"success": False, "message": "Account not found"}
         
-        transaction = account.debit(request.amount, "ATM Withdraw")
+        transaction = account.debit(request.amount, "ATM Withdraw", now)
         if not transaction:
             return {"success": False, "message": "Deposit failed"}
         
@@ -239,12 +429,13 @@ class ATM:
 
         return {
             "success": True,
-            "message": f"Successfully deposited ${request.amount:.2f}",
+            "code": "WITHDRAW_OK",
+            "amount": request.amount,
             "balance": account.get_balance(),
             "transaction_id": transaction.transaction_id
         }
     
-    def _handle_balance_inquiry(self, request: CheckBalanceRequest, atm_system) -> dict:
+    def _handle_balance_inquiry(self, request: CheckBalanceRequest, atm_system, now: datetime) -> dict:
         """Handle balance inquiry request"""
         account = atm_system.get_account(request.account_number)
         if not account:
@@ -253,10 +444,10 @@ class ATM:
         return {
             "success": True,
             "balance": account.get_balance(),
-            "account_type": account.account_type.value
+            "account_type": account.account_type_str
         }
     
-    def _handle_transfer(self, request: AccountTransferRequest, atm_system) -> dict:
+    def _handle_transfer(self, request: AccountTransferRequest, atm_system, now: datetime) -> dict:
         """Handle account transfer request"""
         from_acc = atm_system.get_account(request.account_number)
         to_acc = atm_system.get_account(request.to_account)
@@ -266,36 +457,51 @@ class ATM:
         if not to_acc:
             return {"success": False, "message": "Destination account not found"}
         
-        # Debit from source account
-        from_transaction = from_acc.debit(request.amount, f"Transfer to {request.to_account}")
-        if not from_transaction:
-            return {"success": False, "message": "Transfer failed - insufficient funds"}
-        
-        # Credit to destination account
-        to_transaction = to_acc.credit(request.amount, f"Transfer from {request.account_number}")
-        if not to_transaction:
-            # Rollback the debit if credit fails
-            from_acc.balance += request.amount
-            from_acc.daily_withdrawn -= request.amount
-            return {"success": False, "message": "Transfer failed - destination account issue"}
+        # Lock both accounts in account-number order so opposite transfers can't deadlock
+        first, second = sorted((from_acc, to_acc), key=lambda acc: acc.account_number)
+        debit_description = f"Transfer to {request.to_account}"
+        credit_description = f"Transfer from {request.account_number}"
+        with first._lock, second._lock:
+            # Check the destination up front so the debit never needs rolling back
+            if not to_acc.is_active:
+                return {"success": False, "message": "Transfer failed - destination account issue"}
+            
+            from_transaction = from_acc.debit(request.amount, debit_description, now)
+            if not from_transaction:
+                return {"success": False, "message": "Transfer failed - insufficient funds"}
+            
+            to_acc.credit(request.amount, credit_description, now)
         
         return {
             "success": True,
-            "message": f"Successfully transferred ${request.amount:.2f}",
+            "code": "TRANSFER_OK",
+            "amount": request.amount,
             "from_balance": from_acc.get_balance(),
             "transaction_id": from_transaction.transaction_id
         }
 
 class ATM_System:
-    def __init__(self):
-        self.accounts: Dict[str, Account] = {}
+    def __init__(self, log_path: Optional[str] = None):
+        # Accounts, cards and ATMs live in lists indexed by a compact int id;
+        # the string numbers are only used at the API boundary
+        self.accounts_list: List[Account] = []
+        self.accounts_by_number: Dict[str, int] = {}  # account_number -> index
+        # Most recently looked-up account; an ATM session hits the same one repeatedly
+        self._last_account_number: Optional[str] = None
+        self._last_account: Optional[Account] = None
         self.customers: Dict[str, Customer] = {}
-        self.cards: Dict[str, Card] = {}  # card_number -> Card mapping
-        self.atms: Dict[str, ATM] = {}
+        self._customer_ids = itertools.count()
+        self.cards_list: List[Card] = []
+        self.cards_by_number: Dict[str, int] = {}  # card_number -> index
+        self._card_to_account: Dict[str, Account] = {}  # card_number -> linked Account
+        self.atms_list: List[ATM] = []
+        self.atms_by_id: Dict[str, int] = {}  # atm_id -> index
         self.current_atm: Optional[ATM] = None
+        # Transactions are only persisted when a log path is given
+        self.writer = TransactionWriter(log_path) if log_path else None
     
     def create_customer(self, name: str, phone: str, email: str) -> Customer:
-        customer_id = str(uuid.uuid4())
+        customer_id = f"CUS{next(self._customer_ids):010d}"
         customer = Customer(customer_id, name, phone, email)
         self.customers[customer_id] = customer
         return customer
@@ -304,54 +510,82 @@ class ATM_System:
         if customer_id not in self.customers:
             return None  # Simplified - return None if customer not found
         
-        account_number = f"ACC{len(self.accounts):06d}"
+        account_id = len(self.accounts_list)
+        account_number = f"ACC{account_id:06d}"
         account = Account(account_number, customer_id, account_type, initial_balance)
-        self.accounts[account_number] = account
+        account.writer = self.writer
+        self.accounts_list.append(account)
+        self.accounts_by_number[account_number] = account_id
         
         # Link account to customer
         self.customers[customer_id].add_account(account_number)
         return account
     
     def create_card(self, account_number: str, expiry_date: datetime) -> Card:
-        if account_number not in self.accounts:
+        account = self.get_account(account_number)
+        if not account:
             return None  # Simplified - return None if account not found
         
-        card_number = f"CARD{len(self.cards):010d}"
+        card_id = len(self.cards_list)
+        card_number = f"CARD{card_id:010d}"
         card = Card(card_number, account_number, expiry_date)
-        self.cards[card_number] = card
+        self.cards_list.append(card)
+        self.cards_by_number[card_number] = card_id
+        self._card_to_account[card_number] = account
         
         # Link card to customer
-        account = self.accounts[account_number]
         customer = self.customers[account.customer_id]
-        customer.add_card(card)
+        customer.add_cards(card)
         return card
     
     def add_atm(self, location: str, initial_cash: float = 50000.0) -> ATM:
-        atm_id = f"ATM{len(self.atms):04d}"
+        index = len(self.atms_list)
+        atm_id = f"ATM{index:04d}"
         atm = ATM(atm_id, location, initial_cash)
-        self.atms[atm_id] = atm
+        self.atms_list.append(atm)
+        self.atms_by_id[atm_id] = index
         return atm
     
     def get_account(self, account_number: str) -> Account:
-        return self.accounts.get(account_number)  # Returns None if not found
+        if account_number == self._last_account_number:
+            return self._last_account
+        account_id = self.accounts_by_number.get(account_number)
+        if account_id is None:
+            return None
+        account = self.accounts_list[account_id]
+        self._last_account_number = account_number
+        self._last_account = account
+        return account
+    
+    def get_account_by_id(self, account_id: int) -> Account:
+        """Direct list lookup for callers that already hold the int id"""
+        return self.accounts_list[account_id]
+    
+    def reset_all_daily_limits(self):
+        """Reset the daily withdrawal total of every account; run once a day"""
+        for account in self.accounts_list:
+            account.reset_daily_limit()
     
     def get_account_by_card(self, card_number: str) -> Account:
-        if card_number not in self.cards:
+        return self._card_to_account.get(card_number)
+    
+    def get_atm(self, atm_id: str) -> Optional[ATM]:
+        index = self.atms_by_id.get(atm_id)
+        if index is None:
             return None
-        
-        card = self.cards[card_number]
-        return self.get_account(card.account_number)
+        return self.atms_list[index]
     
     def set_current_atm(self, atm_id: str) -> bool:
-        if atm_id in self.atms:
-            self.current_atm = self.atms[atm_id]
+        atm = self.get_atm(atm_id)
+        if atm:
+            self.current_atm = atm
             return True
         return False
     
     def process_request(self, request: Request, atm_id: str = None) -> dict:
         """Process request through ATM_System (alternative to ATM.process_request)"""
         # Use specified ATM or current ATM
-        atm = self.atms.get(atm_id) if atm_id else self.current_atm
+        atm = self.get_atm(atm_id) if atm_id else self.current_atm
         
         if not atm:
             return {"success": False, "message": "No ATM available"}
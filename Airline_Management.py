@@ -1,8 +1,12 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import List, Dict, Optional
-import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import itertools
+import random
+import sys
 from abc import ABC, abstractmethod
+from types import MappingProxyType
+import bisect
 
 # Enums for better type safety
 class SeatType(Enum):
@@ -39,26 +43,48 @@ class CrewMemberStatus(Enum):
     RETIRED = "Retired"
 
 class Coupon(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def apply(self, amount: float) -> float:
         """Apply the coupon to the given amount and return the discounted amount."""
         pass
 
+    def apply_batch(self, amounts: List[float]) -> List[float]:
+        """Apply the coupon to many amounts at once, e.g. for price quotes."""
+        apply = self.apply
+        return [apply(amount) for amount in amounts]
+
 class PercentageCoupon(Coupon):
+    __slots__ = ('percentage', '_factor')
+
     def __init__(self, percentage: float):
         self.percentage = percentage
+        self._factor = 1 - percentage / 100  # Precomputed multiplier
 
     def apply(self, amount: float) -> float:
-        return amount * (1 - self.percentage / 100)
+        return amount * self._factor
+
+    def apply_batch(self, amounts: List[float]) -> List[float]:
+        factor = self._factor
+        return [amount * factor for amount in amounts]
     
 class FixedAmountCoupon(Coupon):
+    __slots__ = ('discount',)
+
     def __init__(self, discount: float):
         self.discount = discount
 
     def apply(self, amount: float) -> float:
         return max(0, amount - self.discount)
 
+    def apply_batch(self, amounts: List[float]) -> List[float]:
+        discount = self.discount
+        return [max(0, amount - discount) for amount in amounts]
+
 class User:
+    __slots__ = ('user_id', 'name', 'email', 'phone', 'user_type', 'created_at')
+
     def __init__(self, user_id: str, name: str, email: str, phone: str, user_type: UserType):
         self.user_id = user_id
         self.name = name
@@ -68,22 +94,29 @@ class User:
         self.created_at = datetime.now()
 
 class Passenger(User):
+    __slots__ = ('bookings',)
+
     def __init__(self, user_id: str, name: str, email: str, phone: str):
         super().__init__(user_id, name, email, phone, UserType.PASSENGER)
-        self.bookings: List[str] = []  # booking IDs
+        self.bookings: Dict[str, None] = {}  # booking IDs, as an insertion-ordered set
         
     def add_booking(self, booking_id: str):
-        self.bookings.append(booking_id)
+        self.bookings[booking_id] = None
         
     def remove_booking(self, booking_id: str):
-        if booking_id in self.bookings:
-            self.bookings.remove(booking_id)
+        self.bookings.pop(booking_id, None)
 
 class Admin(User):
+    __slots__ = ()
+
     def __init__(self, user_id: str, name: str, email: str, phone: str):
         super().__init__(user_id, name, email, phone, UserType.ADMIN)
 
 class CrewMember(User):
+    __slots__ = ('employee_id', 'crew_type', 'hire_date', 'base_location', 'status',
+                 'assigned_flights', 'certifications', 'flight_hours',
+                 'last_medical_check', 'next_training_due', '_status_listener')
+
     def __init__(self, user_id: str, name: str, email: str, phone: str, 
                  employee_id: str, crew_type: CrewMemberType, hire_date: datetime,
                  base_location: str):
@@ -93,23 +126,25 @@ class CrewMember(User):
         self.hire_date = hire_date
         self.base_location = base_location
         self.status = CrewMemberStatus.ACTIVE
-        self.assigned_flights: List[str] = []  # flight IDs
+        self.assigned_flights: Dict[str, None] = {}  # flight IDs in assignment order
         self.certifications: List[str] = []
         self.flight_hours = 0
         self.last_medical_check: Optional[datetime] = None
         self.next_training_due: Optional[datetime] = None
+        # Set by the owning AirlineManagementSystem so status changes keep its crew index current
+        self._status_listener: Optional[Callable[['CrewMember'], None]] = None
         
     def assign_flight(self, flight_id: str):
         """Assign crew member to a flight"""
         if self.status == CrewMemberStatus.ACTIVE and flight_id not in self.assigned_flights:
-            self.assigned_flights.append(flight_id)
+            self.assigned_flights[flight_id] = None
             return True
         return False
     
     def unassign_flight(self, flight_id: str):
         """Remove crew member from a flight"""
         if flight_id in self.assigned_flights:
-            self.assigned_flights.remove(flight_id)
+            del self.assigned_flights[flight_id]
             return True
         return False
     
@@ -128,6 +163,8 @@ class CrewMember(User):
         if status != CrewMemberStatus.ACTIVE:
             # Remove from all assigned flights if not active
             self.assigned_flights.clear()
+        if self._status_listener is not None:
+            self._status_listener(self)
     
     def is_available_for_flight(self, departure_time: datetime, arrival_time: datetime) -> bool:
         """Check if crew member is available for a specific flight time"""
@@ -142,6 +179,8 @@ class CrewMember(User):
         return True
 
 class Seat:
+    __slots__ = ('seat_number', 'seat_type', 'price', 'is_available')
+
     def __init__(self, seat_number: str, seat_type: SeatType, price: float):
         self.seat_number = seat_number
         self.seat_type = seat_type
@@ -155,6 +194,8 @@ class Seat:
         self.is_available = True
 
 class FlightCompany:
+    __slots__ = ('company_id', 'name', 'code', '_flights')
+
     def __init__(self, company_id: str, name: str, code: str):
         self.company_id = company_id
         self.name = name
@@ -168,6 +209,8 @@ class FlightCompany:
         return self._flights
 
 class CrewAssignment:
+    __slots__ = ('assignment_id', 'flight_id', 'crew_member_id', 'assigned_at', 'is_confirmed')
+
     def __init__(self, assignment_id: str, flight_id: str, crew_member_id: str, 
                  assigned_at: datetime):
         self.assignment_id = assignment_id
@@ -180,30 +223,40 @@ class CrewAssignment:
         self.is_confirmed = True
 
 class Flight:
+    # Minimum crew requirements for a typical commercial flight, shared read-only by all flights
+    _DEFAULT_REQUIRED_CREW = MappingProxyType({
+        CrewMemberType.PILOT: 1,
+        CrewMemberType.CO_PILOT: 1,
+        CrewMemberType.FLIGHT_ATTENDANT: 4,
+        CrewMemberType.PURSER: 1
+    })
+
     def __init__(self, flight_id: str, flight_number: str, company_id: str, 
                  source: str, destination: str, departure_time: datetime, 
                  arrival_time: datetime, total_seats: int):
         self.flight_id = flight_id
-        self.flight_number = flight_number
-        self.company_id = company_id
-        self.source = source
-        self.destination = destination
+        # Codes repeat across many flights; interning shares one copy of each
+        self.flight_number = sys.intern(flight_number)
+        self.company_id = sys.intern(company_id)
+        self.source = sys.intern(source)
+        self.destination = sys.intern(destination)
         self.departure_time = departure_time
         self.arrival_time = arrival_time
+        # Derived values used by search and reporting, computed once
+        self._source_lc = sys.intern(source.lower())
+        self._destination_lc = sys.intern(destination.lower())
+        self._departure_date = departure_time.date()
+        self._duration = arrival_time - departure_time
         self.seats: Dict[str, Seat] = {}
         self.available_seats = total_seats
-        self.crew_assignments: List[str] = []  # CrewAssignment IDs
-        self.required_crew = self._get_required_crew()
+        self.crew_assignments: Dict[str, None] = {}  # CrewAssignment IDs, as an insertion-ordered set
+        self.required_crew = Flight._DEFAULT_REQUIRED_CREW
         self._initialize_seats(total_seats)
+        self._index_available_seats()
         
-    def _get_required_crew(self) -> Dict[CrewMemberType, int]:
-        """Define minimum crew requirements for the flight"""
-        return {
-            CrewMemberType.PILOT: 1,
-            CrewMemberType.CO_PILOT: 1,
-            CrewMemberType.FLIGHT_ATTENDANT: 4,  # Minimum for a typical commercial flight
-            CrewMemberType.PURSER: 1
-        }
+    def set_required_crew(self, required_crew: Dict[CrewMemberType, int]):
+        """Override the default crew requirements for this flight"""
+        self.required_crew = dict(required_crew)
         
     def _initialize_seats(self, total_seats: int):
         # Simple seat allocation: 70% Economy, 20% Business, 10% First
@@ -211,61 +264,119 @@ class Flight:
         business_count = int(total_seats * 0.2)
         first_count = total_seats - economy_count - business_count
         
-        seat_num = 1
-        
-        # First class seats
-        for i in range(first_count):
-            seat_id = f"F{seat_num}"
-            self.seats[seat_id] = Seat(seat_id, SeatType.FIRST, 500.0)
-            seat_num += 1
-            
-        # Business class seats
-        for i in range(business_count):
-            seat_id = f"B{seat_num}"
-            self.seats[seat_id] = Seat(seat_id, SeatType.BUSINESS, 300.0)
-            seat_num += 1
-            
-        # Economy seats
-        for i in range(economy_count):
-            seat_id = f"E{seat_num}"
-            self.seats[seat_id] = Seat(seat_id, SeatType.ECONOMY, 100.0)
-            seat_num += 1
+        # Seats are numbered consecutively: first class, then business, then economy
+        business_start = first_count + 1
+        economy_start = business_start + business_count
+        seat_specs = itertools.chain(
+            ((f"F{n}", SeatType.FIRST, 500.0) for n in range(1, business_start)),
+            ((f"B{n}", SeatType.BUSINESS, 300.0) for n in range(business_start, economy_start)),
+            ((f"E{n}", SeatType.ECONOMY, 100.0) for n in range(economy_start, economy_start + economy_count))
+        )
+        self.seats = {}
+        for seat_id, seat_type, price in seat_specs:
+            seat_id = sys.intern(seat_id)  # Same seat numbers recur on every flight
+            self.seats[seat_id] = Seat(seat_id, seat_type, price)
+    
+    def _index_available_seats(self):
+        """Build per-type buckets of available seats, sorted by (price, seat position)"""
+        self._available_by_type: Dict[SeatType, List[Tuple[float, int, Seat]]] = {t: [] for t in SeatType}
+        self._seat_keys: Dict[str, Tuple[float, int]] = {}
+        # Seats by position plus a parallel availability column, so whole-flight
+        # scans filter a bytearray instead of loading each Seat's flag
+        self._seat_list: List[Seat] = list(self.seats.values())
+        self._available = bytearray(seat.is_available for seat in self._seat_list)
+        for position, seat in enumerate(self._seat_list):
+            key = (seat.price, position)
+            self._seat_keys[seat.seat_number] = key
+            if seat.is_available:
+                self._available_by_type[seat.seat_type].append((*key, seat))
+        for bucket in self._available_by_type.values():
+            bucket.sort()
     
     def get_available_seats(self, seat_type: Optional[SeatType] = None) -> List[Seat]:
-        available = [seat for seat in self.seats.values() if seat.is_available]
-        if seat_type:
-            available = [seat for seat in available if seat.seat_type == seat_type]
-        return available
+        """Available seats; for a given seat type they are returned cheapest first"""
+        if seat_type is not None:
+            return [entry[2] for entry in self._available_by_type[seat_type]]
+        return list(itertools.compress(self._seat_list, self._available))
+    
+    def has_available(self, seat_type: SeatType) -> bool:
+        return bool(self._available_by_type[seat_type])
+    
+    def cheapest_available(self, seat_type: SeatType) -> Optional[Seat]:
+        """Cheapest available seat of this type without building a list, or None"""
+        bucket = self._available_by_type[seat_type]
+        return bucket[0][2] if bucket else None
+    
+    def get_min_available_price(self, seat_type: SeatType) -> Optional[float]:
+        """Price of the cheapest available seat of this type, or None if sold out"""
+        bucket = self._available_by_type[seat_type]
+        return bucket[0][0] if bucket else None
+    
+    def _reserve(self, seat: Seat, bucket_index: int):
+        """Mark an available seat reserved, given its position in its type bucket"""
+        seat.reserve()
+        self._available[self._seat_keys[seat.seat_number][1]] = 0
+        del self._available_by_type[seat.seat_type][bucket_index]
+        self.available_seats -= 1
     
     def reserve_seat(self, seat_number: str) -> bool:
-        if seat_number in self.seats and self.seats[seat_number].is_available:
-            self.seats[seat_number].reserve()
-            self.available_seats -= 1
+        seat = self.seats.get(seat_number)
+        if seat and seat.is_available:
+            bucket = self._available_by_type[seat.seat_type]
+            self._reserve(seat, bisect.bisect_left(bucket, self._seat_keys[seat_number]))
             return True
         return False
     
+    def try_reserve(self, seat_type: Optional[SeatType], preferred_seat: Optional[str] = None) -> Optional[Seat]:
+        """Reserve the preferred seat if it is free and of the right type, otherwise
+        the cheapest available seat of that type; None if the type is sold out.
+        With no seat type, reserve the first available seat on the flight."""
+        if seat_type is None:
+            position = self._available.find(1)
+            if position < 0:
+                return None
+            seat = self._seat_list[position]
+            self.reserve_seat(seat.seat_number)
+            return seat
+        
+        bucket = self._available_by_type[seat_type]
+        if preferred_seat:
+            seat = self.seats.get(preferred_seat)
+            if seat and seat.is_available and seat.seat_type == seat_type:
+                self._reserve(seat, bisect.bisect_left(bucket, self._seat_keys[preferred_seat]))
+                return seat
+        seat = self.cheapest_available(seat_type)
+        if seat:
+            self._reserve(seat, 0)
+        return seat
+    
     def release_seat(self, seat_number: str) -> bool:
-        if seat_number in self.seats and not self.seats[seat_number].is_available:
-            self.seats[seat_number].release()
+        seat = self.seats.get(seat_number)
+        if seat and not seat.is_available:
+            seat.release()
+            key = self._seat_keys[seat_number]
+            self._available[key[1]] = 1
+            bisect.insort(self._available_by_type[seat.seat_type], (*key, seat))
             self.available_seats += 1
             return True
         return False
     
     def add_crew_assignment(self, assignment_id: str):
         """Add crew assignment to flight"""
-        if assignment_id not in self.crew_assignments:
-            self.crew_assignments.append(assignment_id)
+        self.crew_assignments[assignment_id] = None
     
     def remove_crew_assignment(self, assignment_id: str):
         """Remove crew assignment from flight"""
-        if assignment_id in self.crew_assignments:
-            self.crew_assignments.remove(assignment_id)
+        self.crew_assignments.pop(assignment_id, None)
     
     def get_flight_duration(self) -> timedelta:
         """Calculate flight duration"""
-        return self.arrival_time - self.departure_time
+        return self._duration
 
 class Payment:
+    __slots__ = ('payment_id', 'booking_id', 'amount', 'payment_method', 'status',
+                 'created_at', 'processed_at')
+
     def __init__(self, payment_id: str, booking_id: str, amount: float, 
                  payment_method: str = "Credit Card"):
         self.payment_id = payment_id
@@ -281,7 +392,6 @@ class Payment:
         # In real implementation, this would integrate with payment gateway
         try:
             # Simulate success (90% success rate)
-            import random
             if random.random() < 0.9:
                 self.status = PaymentStatus.SUCCESS
                 self.processed_at = datetime.now()
@@ -294,6 +404,8 @@ class Payment:
             return False
 
 class BookingRequest:
+    __slots__ = ('passenger_id', 'flight_id', 'seat_type', 'preferred_seat', 'created_at', 'coupon')
+
     def __init__(self, passenger_id: str, flight_id: str, seat_type: SeatType, 
                  preferred_seat: Optional[str] = None, coupon: Optional[Coupon] = None):
         self.passenger_id = passenger_id
@@ -304,8 +416,12 @@ class BookingRequest:
         self.coupon = coupon
 
 class Booking:
+    __slots__ = ('booking_id', 'passenger_id', 'flight_id', 'seat_number', 'amount',
+                 'status', 'created_at', 'payment_id')
+
     def __init__(self, booking_id: str, passenger_id: str, flight_id: str, 
-                 seat_number: str, amount: float, coupon: Optional[Coupon] = None):
+                 seat_number: str, amount: float, coupon: Optional[Coupon] = None,
+                 created_at: Optional[datetime] = None):
         if coupon:
             amount = coupon.apply(amount)
         if amount < 0:
@@ -316,7 +432,7 @@ class Booking:
         self.seat_number = seat_number
         self.amount = amount
         self.status = BookingStatus.PENDING
-        self.created_at = datetime.now()
+        self.created_at = created_at or datetime.now()
         self.payment_id: Optional[str] = None
     
     def confirm(self, payment_id: str):
@@ -327,6 +443,8 @@ class Booking:
         self.status = BookingStatus.CANCELLED
 
 class CancelRequest:
+    __slots__ = ('booking_id', 'passenger_id', 'reason', 'created_at')
+
     def __init__(self, booking_id: str, passenger_id: str, reason: str = ""):
         self.booking_id = booking_id
         self.passenger_id = passenger_id
@@ -334,6 +452,9 @@ class CancelRequest:
         self.created_at = datetime.now()
 
 class SearchRequest:
+    __slots__ = ('source', 'destination', 'departure_date', 'seat_type', 'max_price', 'created_at',
+                 '_source_lc', '_destination_lc', '_departure_date')
+
     def __init__(self, source: str, destination: str, departure_date: datetime,
                  seat_type: Optional[SeatType] = None, max_price: Optional[float] = None):
         self.source = source
@@ -342,8 +463,13 @@ class SearchRequest:
         self.seat_type = seat_type
         self.max_price = max_price
         self.created_at = datetime.now()
+        self._source_lc = source.lower()
+        self._destination_lc = destination.lower()
+        self._departure_date = departure_date.date()
 
 class CrewSchedulingRequest:
+    __slots__ = ('flight_id', 'required_crew', 'created_at')
+
     def __init__(self, flight_id: str, required_crew: Dict[CrewMemberType, int]):
         self.flight_id = flight_id
         self.required_crew = required_crew
@@ -357,15 +483,29 @@ class AirlineManagementSystem:
         self.bookings: Dict[str, Booking] = {}
         self.payments: Dict[str, Payment] = {}
         self.crew_assignments: Dict[str, CrewAssignment] = {}
+        # Monotonic id sequences, one per kind of record
+        self._user_seq = itertools.count(1)
+        self._company_seq = itertools.count(1)
+        self._flight_seq = itertools.count(1)
+        self._assignment_seq = itertools.count(1)
+        self._booking_seq = itertools.count(1)
+        self._payment_seq = itertools.count(1)
+        # Crew indexes so lookups don't scan every user; dicts used as ordered sets
+        # so results come back in registration order
+        self._crew_by_type: Dict[CrewMemberType, Dict[str, None]] = {t: {} for t in CrewMemberType}
+        self._active_crew: Dict[str, None] = {}
+        # (source, destination, departure date) -> (departure_time, flight ID) kept sorted,
+        # lowercased for case-insensitive search
+        self._flight_index: Dict[Tuple[str, str, date], List[Tuple[datetime, str]]] = {}
 
     def register_passenger(self, name: str, email: str, phone: str) -> str:
-        user_id = str(uuid.uuid4())
+        user_id = f"U{next(self._user_seq)}"
         passenger = Passenger(user_id, name, email, phone)
         self.users[user_id] = passenger
         return user_id
 
     def register_admin(self, name: str, email: str, phone: str) -> str:
-        user_id = str(uuid.uuid4())
+        user_id = f"U{next(self._user_seq)}"
         admin = Admin(user_id, name, email, phone)
         self.users[user_id] = admin
         return user_id
@@ -373,14 +513,45 @@ class AirlineManagementSystem:
     def register_crew_member(self, name: str, email: str, phone: str, 
                            employee_id: str, crew_type: CrewMemberType, 
                            hire_date: datetime, base_location: str) -> str:
-        user_id = str(uuid.uuid4())
+        user_id = f"U{next(self._user_seq)}"
         crew_member = CrewMember(user_id, name, email, phone, employee_id, 
                                 crew_type, hire_date, base_location)
         self.users[user_id] = crew_member
+        self._crew_by_type[crew_type][user_id] = None
+        self._active_crew[user_id] = None
+        crew_member._status_listener = self._on_crew_status_change
         return user_id
     
+    def _get_user(self, user_id: str, user_type: UserType) -> Optional[User]:
+        """Look up a user of the given type by its user_type tag rather than isinstance"""
+        user = self.users.get(user_id)
+        if user is not None and user.user_type is user_type:
+            return user
+        return None
+    
+    def set_crew_status(self, crew_member_id: str, status: CrewMemberStatus) -> bool:
+        """Change a crew member's status"""
+        crew_member = self._get_user(crew_member_id, UserType.CREW_MEMBER)
+        if crew_member is None:
+            return False
+        
+        crew_member.set_status(status)
+        return True
+    
+    def _on_crew_status_change(self, crew_member: CrewMember):
+        """Keep the active-crew index in sync with CrewMember.set_status"""
+        crew_member_id = crew_member.user_id
+        if crew_member.status != CrewMemberStatus.ACTIVE:
+            self._active_crew.pop(crew_member_id, None)
+        elif crew_member_id not in self._active_crew:
+            # Rare; rebuild so the index stays in registration order
+            self._active_crew = {
+                user_id: None for user_id, user in self.users.items()
+                if user.user_type is UserType.CREW_MEMBER and user.status == CrewMemberStatus.ACTIVE
+            }
+    
     def add_company(self, name: str, code: str) -> str:
-        company_id = str(uuid.uuid4())
+        company_id = f"C{next(self._company_seq)}"
         company = FlightCompany(company_id, name, code)
         self.flight_companies[company_id] = company
         return company_id
@@ -391,22 +562,21 @@ class AirlineManagementSystem:
         if company_id not in self.flight_companies:
             raise ValueError("Company not found")
             
-        flight_id = str(uuid.uuid4())
+        flight_id = f"F{next(self._flight_seq)}"
         flight = Flight(flight_id, flight_number, company_id, source, 
                        destination, departure_time, arrival_time, total_seats)
         self.flights[flight_id] = flight
         self.flight_companies[company_id].add_flights(flight_id)
+        key = (flight._source_lc, flight._destination_lc, flight._departure_date)
+        bisect.insort(self._flight_index.setdefault(key, []), (departure_time, flight_id))
         return flight_id
     
-    def assign_crew_to_flight(self, flight_id: str, crew_member_id: str) -> Optional[str]:
+    def assign_crew_to_flight(self, flight_id: str, crew_member_id: str,
+                              now: Optional[datetime] = None) -> Optional[str]:
         """Assign a crew member to a flight"""
-        if (flight_id not in self.flights or crew_member_id not in self.users):
-            return None
-        
-        flight = self.flights[flight_id]
-        crew_member = self.users[crew_member_id]
-        
-        if not isinstance(crew_member, CrewMember):
+        flight = self.flights.get(flight_id)
+        crew_member = self._get_user(crew_member_id, UserType.CREW_MEMBER)
+        if flight is None or crew_member is None:
             return None
         
         # Check if crew member is available for this flight
@@ -414,8 +584,8 @@ class AirlineManagementSystem:
             return None
         
         # Create crew assignment
-        assignment_id = str(uuid.uuid4())
-        assignment = CrewAssignment(assignment_id, flight_id, crew_member_id, datetime.now())
+        assignment_id = f"A{next(self._assignment_seq)}"
+        assignment = CrewAssignment(assignment_id, flight_id, crew_member_id, now or datetime.now())
         
         # Add assignment to both flight and crew member
         if crew_member.assign_flight(flight_id):
@@ -425,6 +595,13 @@ class AirlineManagementSystem:
         
         return None
     
+    def assign_crew_bulk(self, pairs: List[Tuple[str, str]],
+                         now: Optional[datetime] = None) -> List[Optional[str]]:
+        """Assign many (flight_id, crew_member_id) pairs sharing one assigned_at timestamp"""
+        now = now or datetime.now()
+        return [self.assign_crew_to_flight(flight_id, crew_member_id, now)
+                for flight_id, crew_member_id in pairs]
+    
     def unassign_crew_from_flight(self, assignment_id: str) -> bool:
         """Remove crew assignment"""
         if assignment_id not in self.crew_assignments:
@@ -432,9 +609,9 @@ class AirlineManagementSystem:
         
         assignment = self.crew_assignments[assignment_id]
         flight = self.flights.get(assignment.flight_id)
-        crew_member = self.users.get(assignment.crew_member_id)
+        crew_member = self._get_user(assignment.crew_member_id, UserType.CREW_MEMBER)
         
-        if flight and isinstance(crew_member, CrewMember):
+        if flight and crew_member:
             flight.remove_crew_assignment(assignment_id)
             crew_member.unassign_flight(assignment.flight_id)
             del self.crew_assignments[assignment_id]
@@ -445,14 +622,18 @@ class AirlineManagementSystem:
     def get_available_crew(self, departure_time: datetime, arrival_time: datetime, 
                           crew_type: Optional[CrewMemberType] = None) -> List[CrewMember]:
         """Get available crew members for a specific time period"""
-        available_crew = []
+        active_crew = self._active_crew
+        if crew_type is None:
+            candidates = active_crew
+        else:
+            candidates = (crew_member_id for crew_member_id in self._crew_by_type[crew_type]
+                          if crew_member_id in active_crew)
         
-        for user in self.users.values():
-            if (isinstance(user, CrewMember) and 
-                user.is_available_for_flight(departure_time, arrival_time)):
-                
-                if crew_type is None or user.crew_type == crew_type:
-                    available_crew.append(user)
+        available_crew = []
+        for crew_member_id in candidates:
+            crew_member = self.users[crew_member_id]
+            if crew_member.is_available_for_flight(departure_time, arrival_time):
+                available_crew.append(crew_member)
         
         return available_crew
     
@@ -467,74 +648,62 @@ class AirlineManagementSystem:
         for assignment_id in flight.crew_assignments:
             if assignment_id in self.crew_assignments:
                 assignment = self.crew_assignments[assignment_id]
-                crew_member = self.users.get(assignment.crew_member_id)
-                if isinstance(crew_member, CrewMember):
+                crew_member = self._get_user(assignment.crew_member_id, UserType.CREW_MEMBER)
+                if crew_member:
                     crew_members.append(crew_member)
         
         return crew_members
     
     def search_flight(self, search_request: SearchRequest) -> List[Flight]:
         matching_flights = []
+        key = (search_request._source_lc, search_request._destination_lc,
+               search_request._departure_date)
+        
+        # Only flights on this route and date need checking; the bucket is
+        # already in departure order, so results need no final sort
+        for _, flight_id in self._flight_index.get(key, ()):
+            flight = self.flights[flight_id]
+            
+            # Check seat type availability and price constraint if specified
+            if search_request.seat_type is not None:
+                min_price = flight.get_min_available_price(search_request.seat_type)
+                if min_price is None:
+                    continue
+                if search_request.max_price and min_price > search_request.max_price:
+                    continue
+            
+            matching_flights.append(flight)
         
-        for flight in self.flights.values():
-            # Basic matching criteria
-            if (flight.source.lower() == search_request.source.lower() and
-                flight.destination.lower() == search_request.destination.lower() and
-                flight.departure_time.date() == search_request.departure_date.date()):
-                
-                # Check seat type availability if specified
-                if search_request.seat_type:
-                    available_seats = flight.get_available_seats(search_request.seat_type)
-                    if not available_seats:
-                        continue
-                    
-                    # Check price constraint if specified
-                    if search_request.max_price:
-                        min_price = min(seat.price for seat in available_seats)
-                        if min_price > search_request.max_price:
-                            continue
-                
-                matching_flights.append(flight)
-        
-        # Sort by departure time
-        matching_flights.sort(key=lambda f: f.departure_time)
         return matching_flights
     
-    def create_booking(self, booking_request: BookingRequest) -> Optional[str]:
-        if (booking_request.passenger_id not in self.users or 
-            booking_request.flight_id not in self.flights):
+    def create_booking(self, booking_request: BookingRequest,
+                       now: Optional[datetime] = None) -> Optional[str]:
+        passenger = self.users.get(booking_request.passenger_id)
+        flight = self.flights.get(booking_request.flight_id)
+        if passenger is None or flight is None:
             return None
         
-        flight = self.flights[booking_request.flight_id]
-        available_seats = flight.get_available_seats(booking_request.seat_type)
-
-        if not available_seats:
-            return None
-
-        selected_seat = None
-        if booking_request.preferred_seat and booking_request.preferred_seat in flight.seats:
-            preferred = flight.seats[booking_request.preferred_seat]
-            if preferred.is_available and preferred.seat_type == booking_request.seat_type:
-                selected_seat = preferred
-
+        selected_seat = flight.try_reserve(booking_request.seat_type, booking_request.preferred_seat)
         if not selected_seat:
-            selected_seat = available_seats[0]
-
-        if not flight.reserve_seat(selected_seat.seat_number):
             return None
         
-        booking_id = str(uuid.uuid4())
+        booking_id = f"B{next(self._booking_seq)}"
         booking = Booking(booking_id, booking_request.passenger_id, 
                          booking_request.flight_id, selected_seat.seat_number, 
-                         selected_seat.price, booking_request.coupon)
+                         selected_seat.price, booking_request.coupon, now)
         self.bookings[booking_id] = booking
 
-        passenger = self.users[booking_request.passenger_id]
-        if isinstance(passenger, Passenger):
+        if passenger.user_type is UserType.PASSENGER:
             passenger.add_booking(booking_id)
         
         return booking_id
     
+    def create_booking_bulk(self, booking_requests: List[BookingRequest],
+                            now: Optional[datetime] = None) -> List[Optional[str]]:
+        """Create many bookings sharing one created_at timestamp"""
+        now = now or datetime.now()
+        return [self.create_booking(booking_request, now) for booking_request in booking_requests]
+    
     def process_payment_and_confirm(self, booking_id: str, payment_method: str = "Credit Card") -> bool:
         if booking_id not in self.bookings:
             return False
@@ -544,7 +713,7 @@ class AirlineManagementSystem:
             return False
         
         # Create and process payment
-        payment_id = str(uuid.uuid4())
+        payment_id = f"P{next(self._payment_seq)}"
         payment = Payment(payment_id, booking_id, booking.amount, payment_method)
         
         if payment.process_payment():
@@ -558,11 +727,17 @@ class AirlineManagementSystem:
             booking.cancel()
             return False
         
+    def process_payments_bulk(self, booking_ids: List[str], payment_method: str = "Credit Card") -> Dict[str, bool]:
+        """Process payments for several bookings in one call; returns booking_id -> success"""
+        process = self.process_payment_and_confirm
+        return {booking_id: process(booking_id, payment_method) for booking_id in booking_ids}
+        
     def cancel_booking(self, cancel_request: CancelRequest) -> bool:
         booking_id = cancel_request.booking_id
         
-        if (booking_id not in self.bookings or 
-            self.bookings[booking_id].passenger_id != cancel_request.passenger_id):
+        # Ownership is checked against the passenger's own booking set
+        passenger = self._get_user(cancel_request.passenger_id, UserType.PASSENGER)
+        if passenger is None or booking_id not in passenger.bookings:
             return False
         
         booking = self.bookings[booking_id]
@@ -577,28 +752,40 @@ class AirlineManagementSystem:
         booking.cancel()
         
         # Remove from passenger's bookings
-        passenger = self.users[booking.passenger_id]
-        if isinstance(passenger, Passenger):
-            passenger.remove_booking(booking_id)
+        passenger.remove_booking(booking_id)
         
         return True
     
+    def iter_user_bookings(self, user_id: str) -> Iterator[Booking]:
+        """Yield a passenger's bookings lazily"""
+        user = self._get_user(user_id, UserType.PASSENGER)
+        if user is None:
+            return
+        
+        bookings = self.bookings
+        for booking_id in user.bookings:
+            booking = bookings.get(booking_id)
+            if booking is not None:
+                yield booking
+    
     def get_user_bookings(self, user_id: str) -> List[Booking]:
-        user = self.users.get(user_id)
-        if not isinstance(user, Passenger):
-            return []
-        
-        return [self.bookings[booking_id] for booking_id in user.bookings 
-                if booking_id in self.bookings]
+        return list(self.iter_user_bookings(user_id))
+    
+    def iter_crew_schedule(self, crew_member_id: str) -> Iterator[Flight]:
+        """Yield the flights assigned to a crew member lazily"""
+        crew_member = self._get_user(crew_member_id, UserType.CREW_MEMBER)
+        if crew_member is None:
+            return
+        
+        flights = self.flights
+        for flight_id in crew_member.assigned_flights:
+            flight = flights.get(flight_id)
+            if flight is not None:
+                yield flight
     
     def get_crew_schedule(self, crew_member_id: str) -> List[Flight]:
         """Get all flights assigned to a crew member"""
-        crew_member = self.users.get(crew_member_id)
-        if not isinstance(crew_member, CrewMember):
-            return []
-        
-        return [self.flights[flight_id] for flight_id in crew_member.assigned_flights 
-                if flight_id in self.flights]
+        return list(self.iter_crew_schedule(crew_member_id))
     
     def get_flight_details(self, flight_id: str) -> Optional[Flight]:
         return self.flights.get(flight_id)
\ No newline at end of file
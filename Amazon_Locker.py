@@ -3,11 +3,13 @@
 
 #When Deliver person put a package into locker => a notification will send to the person which this package belonged to 
 #That person who recieve the notification will use the code to open the locker
+from collections import deque
 from enum import Enum
 from datetime import datetime
+import queue
 import random
-import string
-from typing import Optional, Dict, List
+import threading
+from typing import Deque, Optional, Dict, List, Tuple
 
 
 class Size(Enum):
@@ -17,13 +19,16 @@ class Size(Enum):
 
     @staticmethod
     def get_larger_sizes(size):
-        """Get a list of sizes equal to or larger than the given size"""
-        if size == Size.SMALL:
-            return [Size.SMALL, Size.MEDIUM, Size.LARGE]
-        elif size == Size.MEDIUM:
-            return [Size.MEDIUM, Size.LARGE]
-        else:
-            return [Size.LARGE]
+        """Get the sizes equal to or larger than the given size, smallest first"""
+        return _LARGER_SIZES[size]
+
+
+# Precomputed answers for Size.get_larger_sizes
+_LARGER_SIZES = {
+    Size.SMALL: (Size.SMALL, Size.MEDIUM, Size.LARGE),
+    Size.MEDIUM: (Size.MEDIUM, Size.LARGE),
+    Size.LARGE: (Size.LARGE,),
+}
 
 
 class LockerStatus(Enum):
@@ -32,13 +37,37 @@ class LockerStatus(Enum):
 
 
 class Notification:
-    @staticmethod
-    def send(recipient_phone: str, message: str) -> None:
-        # In a real system, this would send an SMS or other notification
-        print(f"Notification sent to {recipient_phone}: {message}")
+    # Sends are handed to a background worker so delivery never waits on I/O
+    _queue: "queue.Queue[tuple]" = queue.Queue()
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+
+    @classmethod
+    def send(cls, recipient_phone: str, message: str) -> None:
+        if cls._worker is None:
+            with cls._worker_lock:
+                if cls._worker is None:
+                    cls._worker = threading.Thread(target=cls._run, daemon=True)
+                    cls._worker.start()
+        cls._queue.put((recipient_phone, message))
+
+    @classmethod
+    def flush(cls) -> None:
+        """Block until every queued notification has been sent"""
+        cls._queue.join()
+
+    @classmethod
+    def _run(cls) -> None:
+        while True:
+            recipient_phone, message = cls._queue.get()
+            # In a real system, this would send an SMS or other notification
+            print(f"Notification sent to {recipient_phone}: {message}")
+            cls._queue.task_done()
 
 
 class Package:
+    __slots__ = ('package_id', 'recipient_name', 'recipient_phone', 'size')
+
     def __init__(self, package_id: str, recipient_name: str, recipient_phone: str, size: Size):
         self.package_id = package_id
         self.recipient_name = recipient_name
@@ -47,6 +76,8 @@ class Package:
 
 
 class Locker:
+    __slots__ = ('locker_id', 'size', 'status')
+
     def __init__(self, locker_id: str, size: Size):
         self.locker_id = locker_id
         self.size = size
@@ -73,16 +104,31 @@ class LockerSystem:
         # Dictionary to track which package is in which locker
         self.locker_contents: Dict[str, Package] = {}
 
-        # Dictionary to store access codes for lockers
-        self.access_codes: Dict[str, str] = {}
+        # Access code -> (locker_id, package_id), so pickup validation is one lookup
+        self.access_codes: Dict[str, Tuple[str, str]] = {}
+
+        # Per-system RNG, so code generation doesn't share the module-level instance
+        self._rng = random.Random()
+
+        # Queue of available locker IDs per size, so finding a fit needs no scan
+        self.available_by_size: Dict[Size, Deque[str]] = {size: deque() for size in Size}
 
     def add_locker(self, locker_id: str, size: Size) -> None:
         """Add a new locker to the system"""
         self.lockers[locker_id] = Locker(locker_id, size)
+        self.available_by_size[size].append(locker_id)
 
     def generate_access_code(self) -> str:
-        """Generate a random 6-digit access code"""
-        return ''.join(random.choices(string.digits, k=6))
+        """Generate a random 6-digit access code not currently in use"""
+        getrandbits = self._rng.getrandbits
+        while True:
+            # 20 random bits cover 0..1048575; redraw the few values past 999999
+            n = getrandbits(20)
+            if n >= 1000000:
+                continue
+            code = f"{n:06d}"
+            if code not in self.access_codes:
+                return code
 
     def find_available_locker_for_package(self, package_size: Size) -> Optional[Locker]:
         """Find an available locker for a package with the given size
@@ -93,9 +139,9 @@ class LockerSystem:
         compatible_sizes = Size.get_larger_sizes(package_size)
 
         for size in compatible_sizes:
-            for locker in self.lockers.values():
-                if locker.is_available() and locker.size == size:
-                    return locker
+            available = self.available_by_size[size]
+            if available:
+                return self.lockers[available[0]]
 
         return None
 
@@ -112,17 +158,18 @@ class LockerSystem:
 
         # Store package in locker
         locker.mark_occupied()
+        self.available_by_size[locker.size].popleft()  # The found locker is at the head
         self.locker_contents[locker.locker_id] = package
-        self.access_codes[locker.locker_id] = access_code
+        self.access_codes[access_code] = (locker.locker_id, package.package_id)
 
-        # Send notification to recipient
+        print(f"Package {package.package_id} ({package.size.value}) delivered to " 
+              f"{locker.size.value} locker {locker.locker_id}")
+
+        # Send notification to recipient; queued after the print so console output stays ordered
         message = f"Your package {package.package_id} has been delivered. " \
                   f"Use code {access_code} to open locker {locker.locker_id}."
         Notification.send(package.recipient_phone, message)
 
-        print(f"Package {package.package_id} ({package.size.value}) delivered to " 
-              f"{locker.size.value} locker {locker.locker_id}")
-
         return locker.locker_id
 
     def retrieve_package(self, locker_id: str, access_code: str) -> Optional[Package]:
@@ -138,7 +185,8 @@ class LockerSystem:
             return None
 
         # Verify access code
-        if self.access_codes.get(locker_id) != access_code:
+        entry = self.access_codes.get(access_code)
+        if entry is None or entry[0] != locker_id:
             print("Invalid access code")
             return None
 
@@ -146,9 +194,11 @@ class LockerSystem:
         package = self.locker_contents[locker_id]
 
         # Reset locker
-        self.lockers[locker_id].mark_available()
+        locker = self.lockers[locker_id]
+        locker.mark_available()
+        self.available_by_size[locker.size].append(locker_id)
         del self.locker_contents[locker_id]
-        del self.access_codes[locker_id]
+        del self.access_codes[access_code]
 
         print(f"Locker {locker_id} opened successfully")
         return package
@@ -203,7 +253,9 @@ def main():
     print("\n--- Package Retrieval Test ---")
     # Retrieve a package
     if locker_id1:
-        access_code = locker_system.access_codes[locker_id1]
+        # The recipient would read the code from their notification
+        access_code = next(code for code, (locker_id, _) in locker_system.access_codes.items()
+                           if locker_id == locker_id1)
         print(f"Retrieving package from locker {locker_id1} with code {access_code}")
         retrieved_package = locker_system.retrieve_package(locker_id1, access_code)
 
@@ -215,6 +267,8 @@ def main():
         new_small_package = Package("PKG-S4", "Eve Black", "555-7777", Size.SMALL)
         locker_system.deliver_package(new_small_package)
 
+    Notification.flush()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
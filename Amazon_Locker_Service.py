@@ -1,20 +1,24 @@
-from enum import Enum
+from collections import deque, namedtuple
+from enum import Enum, IntEnum
 from datetime import datetime, timedelta
+import heapq
+import queue
 import random
-import string
-from typing import Dict, List, Optional
+import sys
+import threading
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
 class LockerStatus(Enum):
     FREE = 'free'
     OCCUPIED = 'occupied'
     BROKEN = 'broken'
 
-class LockerSize(Enum):
+class LockerSize(IntEnum):
     SMALL = 1
     MEDIUM = 2
     BIG = 3
 
-class PackageSize(Enum):
+class PackageSize(IntEnum):
     SMALL = 1
     MEDIUM = 2
     BIG = 3
@@ -25,6 +29,8 @@ class NotificationType(Enum):
     PICKUP_CONFIRMATION = 'pickup_confirmation'
 
 class Customer:
+    __slots__ = ('customer_id', 'name', 'email', 'phone')
+
     def __init__(self, customer_id: str, name: str, email: str, phone: str):
         self.customer_id = customer_id
         self.name = name
@@ -32,12 +38,17 @@ class Customer:
         self.phone = phone
 
 class DeliveryMan:
+    __slots__ = ('delivery_id', 'name', 'company')
+
     def __init__(self, delivery_id: str, name: str, company: str):
         self.delivery_id = delivery_id
         self.name = name
         self.company = company
 
 class Package:
+    __slots__ = ('package_id', 'size', 'customer_id', 'tracking_number', 'delivery_time',
+                 'access_code', 'expiry_time')
+
     def __init__(self, package_id: str, package_size: PackageSize, customer_id: str, tracking_number: str):
         self.package_id = package_id
         self.size = package_size
@@ -48,6 +59,13 @@ class Package:
         self.expiry_time = None
 
 class Notification:
+    __slots__ = ('notification_type', 'recipient_id', 'message', 'delivery_method',
+                 'timestamp', 'sent')
+    # One background worker, shared by every LockerSystem, so sending never waits on I/O
+    _queue: "queue.Queue[Tuple[Notification, Customer]]" = queue.Queue()
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+
     def __init__(self, notification_type: NotificationType, recipient_id: str, message: str, delivery_method: str):
         self.notification_type = notification_type
         self.recipient_id = recipient_id
@@ -56,14 +74,42 @@ class Notification:
         self.timestamp = datetime.now()
         self.sent = False
 
+    def send(self, customer: Customer) -> None:
+        """Queue this notification for the background worker"""
+        cls = type(self)
+        if cls._worker is None:
+            with cls._worker_lock:
+                if cls._worker is None:
+                    cls._worker = threading.Thread(target=cls._run, daemon=True)
+                    cls._worker.start()
+        cls._queue.put((self, customer))
+
+    @classmethod
+    def flush(cls) -> None:
+        """Block until every queued notification has been sent"""
+        cls._queue.join()
+
+    @classmethod
+    def _run(cls) -> None:
+        while True:
+            notification, customer = cls._queue.get()
+            # Mock implementation; a real system would send an email or SMS here
+            print(f"Sending {notification.notification_type.value} to {customer.email}: {notification.message}")
+            notification.sent = True
+            cls._queue.task_done()
+
 class DeliverPackageRequest:
+    __slots__ = ('package', 'delivery_man', 'locker_location', 'timestamp')
+
     def __init__(self, package: Package, delivery_man: DeliveryMan, locker_location: str):
         self.package = package
         self.delivery_man = delivery_man
-        self.locker_location = locker_location
+        self.locker_location = sys.intern(locker_location)
         self.timestamp = datetime.now()
 
 class GetPackageRequest:
+    __slots__ = ('customer_id', 'access_code', 'locker_id', 'timestamp')
+
     def __init__(self, customer_id: str, access_code: str, locker_id: str):
         self.customer_id = customer_id
         self.access_code = access_code
@@ -71,10 +117,13 @@ class GetPackageRequest:
         self.timestamp = datetime.now()
 
 class Locker:
+    __slots__ = ('locker_id', 'locker_size', 'location', 'locker_status', 'current_package',
+                 'assigned_time')
+
     def __init__(self, locker_id: str, locker_size: LockerSize, location: str):
         self.locker_id = locker_id
         self.locker_size = locker_size
-        self.location = location
+        self.location = sys.intern(location)  # Shared with every other locker at this location
         self.locker_status = LockerStatus.FREE
         self.current_package = None
         self.assigned_time = None
@@ -85,19 +134,19 @@ class Locker:
     def can_fit_package(self, package_size: PackageSize) -> bool:
         return self.locker_size >= package_size
     
-    def assign_package(self, package: Package) -> None:
+    def assign_package(self, package: Package, now: Optional[datetime] = None) -> None:
         if not self.is_available():
             raise Exception(f"Locker {self.locker_id} is not available")
         
         if not self.can_fit_package(package.size):
-            raise Exception(f"Package size {package.size} doesn't fit in locker size {self.size}")
+            raise Exception(f"Package size {package.size} doesn't fit in locker size {self.locker_size}")
         
         self.current_package = package
-        self.assigned_time = datetime.now()
+        self.assigned_time = now or datetime.now()
         self.locker_status = LockerStatus.OCCUPIED
 
     def release_locker(self) -> Package:
-        if self.status != LockerStatus.OCCUPIED:
+        if self.locker_status != LockerStatus.OCCUPIED:
             raise Exception(f"Locker {self.locker_id} is not occupied")
         
 
@@ -108,21 +157,62 @@ class Locker:
 
         return package
 
+ACCESS_CODE_SPACE = 1000000  # 6-digit codes
+NOTIFICATION_LOG_SIZE = 10000
+
+# What an access code unlocks; one lookup gives the locker and the package in it
+PickupToken = namedtuple('PickupToken', ['locker', 'package'])
+
 class LockerSystem:
     def __init__(self):
         self.lockers: Dict[str, Locker] = {} # locker_id -> Locker
         self.customers: Dict[str, Customer] = {}  # customer_id -> Customer
-        self.packages: Dict[str, Package] = {}  # package_id -> Package
-        self.access_codes: Dict[str, str] = {}  # access_code -> locker_id
-        self.notifications: List[Notification] = []
+        self.access_codes: Dict[str, PickupToken] = {}  # access_code -> PickupToken
+        # One bit per 6-digit code, set while the code is issued
+        self._code_bits = bytearray(ACCESS_CODE_SPACE // 8)
+        # Per-system RNG, so code generation doesn't share the module-level instance
+        self._rng = random.Random()
+        self.notifications: Deque[Notification] = deque(maxlen=NOTIFICATION_LOG_SIZE)  # Most recent only
         self.pickup_expiry_hours = 72
+        self._expiry_delta = timedelta(hours=self.pickup_expiry_hours)
+        # (location, locker size) -> min-heap of free locker IDs, so finding a locker needs no scan;
+        # locker status changes must go through this class to keep it current
+        self._free_lockers: Dict[Tuple[str, LockerSize], List[str]] = {}
+        self._in_free_heap: Set[str] = set()  # Locker IDs with an entry in _free_lockers, so none is pushed twice
+        self._lockers_by_location: Dict[str, List[Locker]] = {}
 
     def add_locker(self, locker: Locker):
         self.lockers[locker.locker_id] = locker
+        self._lockers_by_location.setdefault(locker.location, []).append(locker)
+        if locker.is_available():
+            self._push_free(locker)
     
     def add_customer(self, customer: Customer):
         self.customers[customer.customer_id] = customer
 
+    def mark_locker_broken(self, locker_id: str) -> bool:
+        """Take a free locker out of service"""
+        locker = self.lockers.get(locker_id)
+        if locker is None or not locker.is_available():
+            return False
+        locker.locker_status = LockerStatus.BROKEN  # Its heap entry is dropped on the next search
+        return True
+
+    def repair_locker(self, locker_id: str) -> bool:
+        """Return a broken locker to service"""
+        locker = self.lockers.get(locker_id)
+        if locker is None or locker.locker_status != LockerStatus.BROKEN:
+            return False
+        locker.locker_status = LockerStatus.FREE
+        self._push_free(locker)  # No-op if its entry wasn't dropped while broken
+        return True
+
+    def _push_free(self, locker: Locker):
+        if locker.locker_id not in self._in_free_heap:
+            self._in_free_heap.add(locker.locker_id)
+            heapq.heappush(self._free_lockers.setdefault((locker.location, locker.locker_size), []),
+                           locker.locker_id)
+
     def handle_deliver_package(self, request: DeliverPackageRequest) -> Dict[str, str]:
         try:
             package = request.package
@@ -136,13 +226,16 @@ class LockerSystem:
 
             access_code = self._generate_access_code()
 
-            available_locker.assign_package(package)
+            now = datetime.now()
+            available_locker.assign_package(package, now)
+            # The found locker is at the top of its free heap
+            heapq.heappop(self._free_lockers[(available_locker.location, available_locker.locker_size)])
+            self._in_free_heap.discard(available_locker.locker_id)
             package.access_code = access_code
-            package.delivery_time = datetime.now()
-            package.expiry_time = datetime.now() + timedelta(hours=self.pickup_expiry_hours)
+            package.delivery_time = now
+            package.expiry_time = now + self._expiry_delta
 
-            self.packages[package.package_id] = package
-            self.access_codes[access_code] = available_locker.locker_id
+            self.access_codes[access_code] = PickupToken(available_locker, package)
 
             self._send_delivery_notification(package)
 
@@ -164,22 +257,20 @@ class LockerSystem:
         """Handle package pickup request"""
         try:
             # Validate access code
-            if request.access_code not in self.access_codes:
+            token = self.access_codes.get(request.access_code)
+            if token is None:
                 return {
                     "success": False,
                     "message": "Invalid access code"
                 }
 
-            expected_locker_id = self.access_codes[request.access_code]
-            if expected_locker_id != request.locker_id:
+            locker, package = token
+            if locker.locker_id != request.locker_id:
                 return {
                     "success": False,
                     "message": "Access code doesn't match the locker"
                 }
 
-            locker = self.lockers[request.locker_id]
-            package = locker.current_package
-
             # Validate customer
             if package.customer_id != request.customer_id:
                 return {
@@ -195,11 +286,12 @@ class LockerSystem:
                 }
 
             # Release package from locker
-            released_package = locker.release_package()
+            released_package = locker.release_locker()
+            self._push_free(locker)
             
             # Clean up
             del self.access_codes[request.access_code]
-            del self.packages[package.package_id]
+            self._release_access_code(request.access_code)
 
             # Send pickup confirmation
             self._send_pickup_confirmation(released_package)
@@ -219,24 +311,35 @@ class LockerSystem:
 
 
     def _find_available_lockers(self, package_size: PackageSize, location: str) -> Optional[Locker]:
-        available_lockers = [
-            locker for locker in self.lockers.values()
-            if locker.location == location and 
-               locker.is_available() and 
-               locker.can_fit_package(package_size)
-        ]
-        
-        if not available_lockers:
-            return None
+        # Smallest locker size that fits and has a free locker at this location
+        location = sys.intern(location)
+        for locker_size in LockerSize:
+            if locker_size < package_size:
+                continue
+            free = self._free_lockers.get((location, locker_size))
+            # Drop entries for lockers that stopped being free (e.g. broken); repair_locker re-pushes them
+            while free and not self.lockers[free[0]].is_available():
+                self._in_free_heap.discard(heapq.heappop(free))
+            if free:
+                return self.lockers[free[0]]
         
-        return min(available_lockers, key=lambda l: l.size.value)
+        return None
 
     def _generate_access_code(self) -> str:
         """Generate a unique 6-digit access code"""
-        while True:
-            code = ''.join(random.choices(string.digits, k=6))
-            if code not in self.access_codes:
-                return code
+        # Random start, then probe forward to the next free code
+        start = self._rng.randrange(ACCESS_CODE_SPACE)
+        bits = self._code_bits
+        for offset in range(ACCESS_CODE_SPACE):
+            i = (start + offset) % ACCESS_CODE_SPACE
+            if not (bits[i >> 3] >> (i & 7)) & 1:
+                bits[i >> 3] |= 1 << (i & 7)
+                return f"{i:06d}"
+        raise Exception("No access codes available")
+
+    def _release_access_code(self, code: str):
+        i = int(code)
+        self._code_bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
             
     def _send_delivery_notification(self, package: Package):
         customer = self.customers.get(package.customer_id)
@@ -269,16 +372,21 @@ class LockerSystem:
             self._send_notification(notification, customer)
 
     def _send_notification(self, notification: Notification, customer: Customer):
-        """Actually send the notification (mock implementation)"""
-        print(f"Sending {notification.notification_type.value} to {customer.email}: {notification.message}")
-        notification.sent = True
+        notification.send(customer)
+
+    def flush_notifications(self):
+        """Block until every queued notification has been sent"""
+        Notification.flush()
 
     def get_locker_status(self, locker_id: str) -> Dict:
         """Get status of a specific locker"""
-        if locker_id not in self.lockers:
+        locker = self.lockers.get(locker_id)
+        if locker is None:
             return {"error": "Locker not found"}
         
-        locker = self.lockers[locker_id]
+        return self._locker_status(locker)
+
+    def _locker_status(self, locker: Locker) -> Dict:
         return {
             "locker_id": locker.locker_id,
             "size": locker.locker_size.name,
@@ -290,11 +398,8 @@ class LockerSystem:
 
     def get_all_lockers_status(self, location: str = None) -> List[Dict]:
         """Get status of all lockers, optionally filtered by location"""
-        lockers = self.lockers.values()
-        if location:
-            lockers = [l for l in lockers if l.location == location]
-        
-        return [self.get_locker_status(locker.locker_id) for locker in lockers]
+        lockers = self._lockers_by_location.get(location, ()) if location else self.lockers.values()
+        return [self._locker_status(locker) for locker in lockers]
     
 
 if __name__ == "__main__":
@@ -328,4 +433,5 @@ if __name__ == "__main__":
         print("Pickup Result:", pickup_result)
     
     # Check locker status
-    print("Locker Status:", locker_system.get_all_lockers_status("Downtown"))
\ No newline at end of file
+    print("Locker Status:", locker_system.get_all_lockers_status("Downtown"))
+    locker_system.flush_notifications()
\ No newline at end of file
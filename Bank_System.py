@@ -1,6 +1,7 @@
-import datetime
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, Optional, ValuesView
+import itertools
 import uuid
 
 class AccountType(Enum):
@@ -13,20 +14,24 @@ class RequestStatus(Enum):
     REJECTED = "REJECTED"
 
 class Customer:
+    __slots__ = ('customer_id', 'name', 'email', 'phone', 'accounts')
+
     def __init__(self, customer_id: str, name: str, email: str, phone: str):
         self.customer_id = customer_id
         self.name = name
         self.email = email
         self.phone = phone
-        self.accounts: List['Account'] = []
+        self.accounts: Dict[str, 'Account'] = {}  # account_id -> Account
     
     def add_account(self, account: 'Account'):
-        self.accounts.append(account)
+        self.accounts[account.account_id] = account
     
-    def get_accounts(self) -> List['Account']:
-        return self.accounts
+    def get_accounts(self) -> ValuesView['Account']:
+        return self.accounts.values()
 
 class Account:
+    __slots__ = ('account_id', 'customer_id', 'account_type', 'balance', 'created_at', 'is_active')
+
     def __init__(self, account_id: str, customer_id: str, account_type: AccountType, initial_balance: float = 0.0):
         self.account_id = account_id
         self.customer_id = customer_id
@@ -54,6 +59,8 @@ class Account:
         self.is_active = False
 
 class Request:
+    __slots__ = ('request_id', 'customer_id', 'status', 'created_at', 'processed_at')
+
     def __init__(self, request_id: str, customer_id: str):
         self.request_id = request_id
         self.customer_id = customer_id
@@ -70,18 +77,24 @@ class Request:
         self.processed_at = datetime.now()
 
 class OpenAccountRequest(Request):
+    __slots__ = ('account_type', 'initial_deposit')
+
     def __init__(self, request_id: str, customer_id: str, account_type: AccountType, initial_deposit: float = 0.0):
         super().__init__(request_id, customer_id)
         self.account_type = account_type
         self.initial_deposit = initial_deposit
 
 class DepositRequest(Request):
+    __slots__ = ('account_id', 'amount')
+
     def __init__(self, request_id: str, customer_id: str, account_id: str, amount: float):
         super().__init__(request_id, customer_id)
         self.account_id = account_id
         self.amount = amount
 
 class WithdrawRequest(Request):
+    __slots__ = ('account_id', 'amount')
+
     def __init__(self, request_id: str, customer_id: str, account_id: str, amount: float):
         super().__init__(request_id, customer_id)
         self.account_id = account_id
@@ -94,6 +107,7 @@ class Bank:
         self.customers: dict[str, Customer] = {}
         self.requests: dict[str, Request] = {}
         self.accounts: dict[str, Account] = {}
+        self._id_counter = itertools.count(1)  # Internal account ids
 
     def add_customer(self, customer: Customer) -> bool:
         if customer.customer_id in self.customers:
@@ -108,13 +122,13 @@ class Bank:
         return self.accounts.get(account_id)
     
     def handle_open_account_request(self, request: OpenAccountRequest) -> bool:
-        customer = self.customers[request.customer_id]
+        customer = self.customers.get(request.customer_id)
         if not customer:
             request.reject()
             return False
 
-        account_id = str(uuid.uuid4())
-        new_account = Account(request.customer_id, request.account_type, request.initial_deposit)
+        account_id = f"acc-{next(self._id_counter)}"
+        new_account = Account(account_id, request.customer_id, request.account_type, request.initial_deposit)
 
         self.accounts[account_id] = new_account
         customer.add_account(new_account)
@@ -123,34 +137,29 @@ class Bank:
         return True
     
     def handle_deposit_request(self, request: DepositRequest) -> bool:
-        account = self.accounts[request.account_id]
-        if not account or not account.is_active:
-            request.reject()
-            return False
-        
-        if account.deposit(request.amount):
-            request.approve()
-            return True
-        else:
-            request.reject()
-            return False
+        return self._apply(request, "deposit")
         
     def handle_withdraw_request(self, request: WithdrawRequest) -> bool:
-        account = self.accounts[request.account_id]
+        return self._apply(request, "withdraw")
+
+    def _apply(self, request: Request, op_name: str) -> bool:
+        """Run an account operation for a deposit/withdraw request and settle the request"""
+        account = self.accounts.get(request.account_id)
         if not account or not account.is_active:
             request.reject()
             return False
-        
-        if account.withdraw(request.amount):
+
+        ok = getattr(account, op_name)(request.amount)
+        if ok:
             request.approve()
-            return True
         else:
             request.reject()
-            return False
+        return ok
 
 class BankSystem:
     def __init__(self):
         self.banks: dict[str, Bank] = {}
+        self._id_counter = itertools.count(1)  # Internal request ids
 
     def add_bank(self, bank: Bank) -> bool:
         if bank.bank_id in self.banks:
@@ -179,7 +188,7 @@ class BankSystem:
         if not bank:
             return False
         
-        request_id = str(uuid.uuid4())
+        request_id = f"req-{next(self._id_counter)}"
         request = OpenAccountRequest(request_id, customer_id, account_type, initial_deposit)
         bank.requests[request_id] = request
 
@@ -190,7 +199,7 @@ class BankSystem:
         if not bank:
             return False
         
-        request_id = str(uuid.uuid4())
+        request_id = f"req-{next(self._id_counter)}"
         request = DepositRequest(request_id, customer_id, amount)
         bank.requests[request_id] = request
 
@@ -201,7 +210,7 @@ class BankSystem:
         if not bank:
             return False
         
-        request_id = str(uuid.uuid4())
+        request_id = f"req-{next(self._id_counter)}"
         request = WithdrawRequest(request_id, customer_id, amount)
         bank.requests[request_id] = request
 
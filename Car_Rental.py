@@ -1,9 +1,18 @@
 from datetime import datetime, timedelta
-from enum import Enum
-from typing import List, Dict, Optional
+from enum import Enum, IntFlag
+from typing import List, Dict, Optional, Set
 from abc import ABC, abstractmethod
+from array import array
+from collections import defaultdict
+from itertools import compress
+import bisect
+import itertools
+import logging
+import time
 import uuid
 
+_log = logging.getLogger(__name__)
+
 class CarType(Enum):
     ECONOMY = "economy"
     COMPACT = "compact"
@@ -19,11 +28,14 @@ class CarStatus(Enum):
     MAINTENANCE = "maintenance" 
     OUT_OF_SERVICE = "out_of_service"
 
-class BookingStatus(Enum):
-    PENDING = "pending"
-    CONFIRMED = "confirmed"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled"
+class BookingStatus(IntFlag):
+    # One bit per status, so "is it one of these" is a single AND
+    PENDING = 1
+    CONFIRMED = 2
+    COMPLETED = 4
+    CANCELLED = 8
+
+_CANCELLABLE = BookingStatus.PENDING | BookingStatus.CONFIRMED
 
 class PaymentStatus(Enum):
     PENDING = "pending"
@@ -38,16 +50,24 @@ class PaymentMethod(Enum):
     DIGITAL_WALLET = "digital_wallet"
 
 class DrivingLicense:
+    __slots__ = ('license_number', 'expiry_date', 'issued_country', 'issued_state', '_expiry_ts')
+
     def __init__(self, license_number: str, expiry_date: datetime, issued_country: str, issued_state: str):
         self.license_number = license_number
         self.expiry_date = expiry_date
         self.issued_country = issued_country
         self.issued_state = issued_state
+        self._expiry_ts = expiry_date.timestamp()  # Checked against time.time(), cheaper than datetime.now()
     
-    def is_valid(self) -> bool:
-        return self.expiry_date > datetime.now()
+    def is_valid(self, now_ts: Optional[float] = None) -> bool:
+        if now_ts is None:
+            now_ts = time.time()
+        return self._expiry_ts > now_ts
     
 class Customer:
+    __slots__ = ('customer_id', 'name', 'email', 'phone', 'address', 'driving_license',
+                 'booking_history')
+
     def __init__(self, customer_id: str, name: str, email: str, 
                  phone: str, address: str, driving_license: DrivingLicense):
         self.customer_id = customer_id
@@ -58,10 +78,12 @@ class Customer:
         self.driving_license = driving_license
         self.booking_history: List[str] = []  # booking IDs
     
-    def can_rent_car(self) -> bool:
-        return self.driving_license.is_valid()
+    def can_rent_car(self, now_ts: Optional[float] = None) -> bool:
+        return self.driving_license.is_valid(now_ts)
     
 class Location:
+    __slots__ = ('location_id', 'name', 'address', 'city', 'state', 'zip_code')
+
     def __init__(self, location_id: str, name: str, address: str, 
                  city: str, state: str, zip_code: str):
         self.location_id = location_id
@@ -72,6 +94,9 @@ class Location:
         self.zip_code = zip_code
 
 class Car:
+    __slots__ = ('car_id', 'license_plate', 'make', 'model', 'year', 'car_type', 'daily_rate',
+                 'status', 'location', 'mileage', 'features')
+
     def __init__(self, car_id: str, license_plate: str, make: str, 
                  model: str, year: int, car_type: CarType, 
                  daily_rate: float, location: Location):
@@ -110,28 +135,36 @@ class PaymentStrategy(ABC):
 class CreditCardPayment(PaymentStrategy):
     def process_payment(self, amount: float, payment_details: Dict) -> bool:
         # Simulate credit card processing
-        card_number = payment_details.get('card_number')
-        cvv = payment_details.get('cvv')
-        expiry = payment_details.get('expiry')
-        
-        # Basic validation simulation
-        if card_number and cvv and expiry:
-            print(f"Processing credit card payment of ${amount}")
+        # Basic validation simulation; stops at the first missing field
+        get = payment_details.get
+        if get('card_number') and get('cvv') and get('expiry'):
+            _log.debug("Processing credit card payment of $%s", amount)
             return True
         return False
 
 class DebitCardPayment(PaymentStrategy):
     def process_payment(self, amount: float, payment_details: Dict) -> bool:
         # Simulate debit card processing
-        print(f"Processing debit card payment of ${amount}")
+        _log.debug("Processing debit card payment of $%s", amount)
         return True
 
 class CashPayment(PaymentStrategy):
     def process_payment(self, amount: float, payment_details: Dict) -> bool:
-        print(f"Processing cash payment of ${amount}")
+        _log.debug("Processing cash payment of $%s", amount)
         return True
 
+# Strategies are stateless, so every Payment shares these instances
+_PAYMENT_STRATEGIES: Dict[PaymentMethod, PaymentStrategy] = {
+    PaymentMethod.CREDIT_CARD: CreditCardPayment(),
+    PaymentMethod.DEBIT_CARD: DebitCardPayment(),
+    PaymentMethod.CASH: CashPayment(),
+    PaymentMethod.DIGITAL_WALLET: CreditCardPayment()  # Similar to credit card
+}
+
 class Payment:
+    __slots__ = ('payment_id', 'amount', 'payment_method', 'payment_details', 'status',
+                 'payment_date', 'payment_strategy')
+
     def __init__(self, payment_id: str, amount: float, 
                  payment_method: PaymentMethod, payment_details: Dict):
         self.payment_id = payment_id
@@ -143,27 +176,29 @@ class Payment:
         self.payment_strategy = self._get_payment_strategy()
     
     def _get_payment_strategy(self) -> PaymentStrategy:
-        strategies = {
-            PaymentMethod.CREDIT_CARD: CreditCardPayment(),
-            PaymentMethod.DEBIT_CARD: DebitCardPayment(),
-            PaymentMethod.CASH: CashPayment(),
-            PaymentMethod.DIGITAL_WALLET: CreditCardPayment()  # Similar to credit card
-        }
-        return strategies.get(self.payment_method, CashPayment())
+        return _PAYMENT_STRATEGIES.get(self.payment_method, _PAYMENT_STRATEGIES[PaymentMethod.CASH])
     
-    def process(self) -> bool:
+    def process(self, now: Optional[datetime] = None) -> bool:
         success = self.payment_strategy.process_payment(self.amount, self.payment_details)
         if success:
             self.status = PaymentStatus.COMPLETED
-            self.payment_date = datetime.now()
+            self.payment_date = now or datetime.now()
         else:
             self.status = PaymentStatus.FAILED
         return success
 
+TAX_RATE = 0.1  # 10% tax
+INSURANCE_PER_DAY = 15.0
+
 class Booking:
+    __slots__ = ('booking_id', 'customer', 'car', 'pickup_date', 'return_date', 'pickup_location',
+                 'return_location', 'status', 'total_amount', 'payment', 'created_date',
+                 'actual_return_date')
+
     def __init__(self, booking_id: str, customer: Customer, car: Car,
                  pickup_date: datetime, return_date: datetime,
-                 pickup_location: Location, return_location: Location):
+                 pickup_location: Location, return_location: Location,
+                 created_date: Optional[datetime] = None):
         self.booking_id = booking_id
         self.customer = customer
         self.car = car
@@ -174,29 +209,20 @@ class Booking:
         self.status = BookingStatus.PENDING
         self.total_amount = self._calculate_total_amount()
         self.payment: Optional[Payment] = None
-        self.created_date = datetime.now()
+        self.created_date = created_date or datetime.now()
         self.actual_return_date: Optional[datetime] = None
     
     def _calculate_total_amount(self) -> float:
-        days = (self.return_date - self.pickup_date).days
-        if days <= 0:
-            days = 1  # Minimum 1 day rental
+        days = max(1, (self.return_date - self.pickup_date).days)  # Minimum 1 day rental
         
-        base_amount = days * self.car.daily_rate
-        
-        # Add fees (taxes, insurance, etc.)
-        tax_rate = 0.1  # 10% tax
-        insurance_per_day = 15.0
-        
-        total = base_amount + (days * insurance_per_day)
-        total += total * tax_rate
-        
-        return round(total, 2)
+        # Daily rate plus insurance, then tax on the whole (same operation order as before, so rounding matches)
+        total = days * self.car.daily_rate + days * INSURANCE_PER_DAY
+        return round(total + total * TAX_RATE, 2)
     
-    def confirm_booking(self) -> bool:
+    def confirm_booking(self, now_ts: Optional[float] = None) -> bool:
         if (self.status == BookingStatus.PENDING and 
             self.car.is_available() and 
-            self.customer.can_rent_car()):
+            self.customer.can_rent_car(now_ts)):
             
             if self.car.rent():
                 self.status = BookingStatus.CONFIRMED
@@ -205,7 +231,7 @@ class Booking:
         return False
     
     def cancel_booking(self) -> bool:
-        if self.status in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
+        if self.status & _CANCELLABLE:
             self.status = BookingStatus.CANCELLED
             self.car.return_car()
             return True
@@ -259,13 +285,72 @@ class CarRentalSystem:
         self.bookings: Dict[str, Booking] = {}
         self.locations: Dict[str, Location] = {}
         self.payments: Dict[str, Payment] = {}
+        self._payment_ids = itertools.count(1)  # Internal payment ids
+        # Search indexes over car IDs; car status changes must go through this class to keep them current
+        self._by_type: Dict[CarType, Set[str]] = defaultdict(set)
+        self._by_location: Dict[str, Set[str]] = defaultdict(set)
+        self._available: Set[str] = set()
+        # Cars by price as two parallel columns, cheapest first (ties in insertion order)
+        self._price_rates: List[float] = []
+        self._price_car_ids: List[str] = []
+        self._car_seq: Dict[str, int] = {}  # car_id -> insertion order, breaks price ties in filtered searches
+        self._bookings_by_customer: Dict[str, List[str]] = defaultdict(list)  # customer_id -> booking IDs, oldest first
+        # Booking ledger for revenue reports, stored column-wise in creation order (one row per booking)
+        self._ledger_rows: Dict[str, int] = {}  # booking_id -> row
+        self._ledger_created: List[datetime] = []
+        self._ledger_amounts = array('d')
+        self._ledger_paid = bytearray()  # 1 once the booking is completed with a completed payment
     
     def add_car(self, car: Car) -> bool:
         """Add a new car to the system"""
         if car.car_id not in self.cars:
+            self._car_seq[car.car_id] = len(self.cars)
             self.cars[car.car_id] = car
+            self._by_type[car.car_type].add(car.car_id)
+            self._by_location[car.location.location_id].add(car.car_id)
+            i = bisect.bisect_right(self._price_rates, car.daily_rate)
+            self._price_rates.insert(i, car.daily_rate)
+            self._price_car_ids.insert(i, car.car_id)
+            if car.is_available():
+                self._available.add(car.car_id)
             return True
         return False
+
+    def add_cars_bulk(self, cars: List[Car]) -> int:
+        """Add many cars at once, skipping IDs already present; returns how many were added"""
+        new_cars: Dict[str, Car] = {}
+        for car in cars:
+            if car.car_id not in self.cars:
+                new_cars.setdefault(car.car_id, car)
+        
+        for car_id in new_cars:
+            self._car_seq[car_id] = len(self._car_seq)
+        self.cars.update(new_cars)
+        for car_id, car in new_cars.items():
+            self._by_type[car.car_type].add(car_id)
+            self._by_location[car.location.location_id].add(car_id)
+        self._available.update(car_id for car_id, car in new_cars.items() if car.is_available())
+        
+        # One sort instead of an insert per car; stable, so ties stay in insertion order
+        by_price = sorted(self.cars.values(), key=lambda car: car.daily_rate)
+        self._price_rates = [car.daily_rate for car in by_price]
+        self._price_car_ids = [car.car_id for car in by_price]
+        return len(new_cars)
+
+    def set_car_status(self, car_id: str, status: CarStatus) -> bool:
+        """Change a car's status (e.g. to or from maintenance)"""
+        car = self.cars.get(car_id)
+        if not car:
+            return False
+        car.status = status
+        self._sync_availability(car)
+        return True
+
+    def _sync_availability(self, car: Car):
+        if car.is_available():
+            self._available.add(car.car_id)
+        else:
+            self._available.discard(car.car_id)
     
     def add_customer(self, customer: Customer) -> bool:
         """Add a new customer to the system"""
@@ -281,39 +366,60 @@ class CarRentalSystem:
             return True
         return False
     
+    def add_customers_bulk(self, customers: List[Customer]) -> int:
+        """Add many customers at once, skipping IDs already present; returns how many were added"""
+        new_customers = {}
+        for customer in customers:
+            if customer.customer_id not in self.customers:
+                new_customers.setdefault(customer.customer_id, customer)
+        self.customers.update(new_customers)
+        return len(new_customers)
+    
+    def add_locations_bulk(self, locations: List[Location]) -> int:
+        """Add many locations at once, skipping IDs already present; returns how many were added"""
+        new_locations = {}
+        for location in locations:
+            if location.location_id not in self.locations:
+                new_locations.setdefault(location.location_id, location)
+        self.locations.update(new_locations)
+        return len(new_locations)
+    
     def search_cars(self, search_request: SearchRequest) -> List[Car]:
         """Search for available cars based on criteria"""
-        available_cars = []
+        candidates = self._available
+        cars = self.cars
+        max_price = search_request.max_price
         
-        for car in self.cars.values():
-            if not car.is_available():
-                continue
-            
+        if search_request.car_type or search_request.pickup_location:
             # Filter by car type
-            if (search_request.car_type and 
-                car.car_type != search_request.car_type):
-                continue
+            if search_request.car_type:
+                candidates = candidates & self._by_type.get(search_request.car_type, set())
             
             # Filter by location
-            if (search_request.pickup_location and 
-                car.location.location_id != search_request.pickup_location.location_id):
-                continue
-            
-            # Filter by price
-            if (search_request.max_price and 
-                car.daily_rate > search_request.max_price):
-                continue
+            if search_request.pickup_location:
+                candidates = candidates & self._by_location.get(search_request.pickup_location.location_id, set())
             
-            available_cars.append(car)
+            # The filtered set is usually small, so sort just it by price
+            matches = [cars[car_id] for car_id in candidates
+                       if not max_price or cars[car_id].daily_rate <= max_price]
+            car_seq = self._car_seq
+            matches.sort(key=lambda car: (car.daily_rate, car_seq[car.car_id]))
+            return matches
         
-        # Sort by daily rate (cheapest first)
-        available_cars.sort(key=lambda x: x.daily_rate)
-        return available_cars
+        # Unfiltered: cars within the price limit are a prefix of the price columns
+        car_ids = self._price_car_ids
+        if max_price:
+            car_ids = car_ids[:bisect.bisect_right(self._price_rates, max_price)]
+        return [cars[car_id] for car_id in car_ids if car_id in candidates]
     
     def create_booking(self, booking_request: BookingRequest) -> Optional[Booking]:
         """Create a new booking"""
+        # One clock read for the whole request
+        now = datetime.now()
+        now_ts = now.timestamp()
+
         # Validate request
-        if not booking_request.customer.can_rent_car():
+        if not booking_request.customer.can_rent_car(now_ts):
             return None
         
         if not booking_request.car.is_available():
@@ -331,11 +437,12 @@ class CarRentalSystem:
             pickup_date=booking_request.pickup_date,
             return_date=booking_request.return_date,
             pickup_location=booking_request.pickup_location,
-            return_location=booking_request.return_location
+            return_location=booking_request.return_location,
+            created_date=now
         )
         
         # Process payment
-        payment_id = str(uuid.uuid4())
+        payment_id = f"pay-{next(self._payment_ids)}"
         payment = Payment(
             payment_id=payment_id,
             amount=booking.total_amount,
@@ -343,12 +450,18 @@ class CarRentalSystem:
             payment_details=booking_request.payment_details
         )
         
-        if payment.process():
+        if payment.process(now):
             booking.payment = payment
             self.payments[payment_id] = payment
             
-            if booking.confirm_booking():
+            if booking.confirm_booking(now_ts):
+                self._sync_availability(booking.car)
                 self.bookings[booking_id] = booking
+                self._bookings_by_customer[booking.customer.customer_id].append(booking_id)
+                self._ledger_rows[booking_id] = len(self._ledger_created)
+                self._ledger_created.append(booking.created_date)
+                self._ledger_amounts.append(booking.total_amount)
+                self._ledger_paid.append(0)
                 return booking
         
         return None
@@ -365,11 +478,12 @@ class CarRentalSystem:
             return False
         
         # Check if cancellation is allowed
-        if booking.status not in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
+        if not booking.status & _CANCELLABLE:
             return False
         
         # Process cancellation
         if booking.cancel_booking():
+            self._sync_availability(booking.car)
             # Process refund if payment was made
             if booking.payment and booking.payment.status == PaymentStatus.COMPLETED:
                 booking.payment.status = PaymentStatus.REFUNDED
@@ -391,37 +505,33 @@ class CarRentalSystem:
         booking.car.mileage += return_mileage
         
         # Complete booking
-        return booking.complete_booking()
+        if booking.complete_booking():
+            self._sync_availability(booking.car)
+            if booking.payment and booking.payment.status == PaymentStatus.COMPLETED:
+                self._ledger_paid[self._ledger_rows[booking_id]] = 1
+            return True
+        return False
     
     def get_customer_bookings(self, customer_id: str) -> List[Booking]:
         """Get all bookings for a customer"""
-        customer_bookings = []
-        for booking in self.bookings.values():
-            if booking.customer.customer_id == customer_id:
-                customer_bookings.append(booking)
-        
-        # Sort by creation date (newest first)
-        customer_bookings.sort(key=lambda x: x.created_date, reverse=True)
-        return customer_bookings
+        # Booking IDs are appended as bookings are created, so reversing gives newest first
+        return [self.bookings[booking_id]
+                for booking_id in reversed(self._bookings_by_customer.get(customer_id, ()))]
     
     def get_available_cars_count(self) -> int:
         """Get count of available cars"""
-        return len([car for car in self.cars.values() if car.is_available()])
+        return len(self._available)
     
     def get_revenue_report(self, start_date: datetime, end_date: datetime) -> Dict:
         """Generate revenue report for a date range"""
-        total_revenue = 0.0
-        total_bookings = 0
-        completed_bookings = 0
-        
-        for booking in self.bookings.values():
-            if (start_date <= booking.created_date <= end_date):
-                total_bookings += 1
-                if (booking.status == BookingStatus.COMPLETED and 
-                    booking.payment and 
-                    booking.payment.status == PaymentStatus.COMPLETED):
-                    total_revenue += booking.total_amount
-                    completed_bookings += 1
+        # Ledger rows are in creation order, so the date range is one contiguous slice
+        lo = bisect.bisect_left(self._ledger_created, start_date)
+        hi = bisect.bisect_right(self._ledger_created, end_date)
+        paid = self._ledger_paid[lo:hi]
+
+        total_revenue = sum(compress(self._ledger_amounts[lo:hi], paid), 0.0)
+        total_bookings = max(hi - lo, 0)
+        completed_bookings = sum(paid)
         
         return {
             'total_revenue': total_revenue,
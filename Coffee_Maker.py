@@ -1,4 +1,14 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import heapq
+import itertools
+import logging
+import random
+
+_log = logging.getLogger(__name__)
 
 
 class Coffee(ABC):
@@ -35,48 +45,47 @@ class Cappuccino(Coffee):
         return 6.0
     
 class CoffeeDecorator(Coffee):
+    # Cost and description are computed once at construction, so reading them doesn't walk the chain
     def __init__(self, coffee: Coffee):
         self._coffee = coffee
+        self._cost = coffee.get_cost()
+        self._description = coffee.get_description()
 
     def get_description(self):
-        return self._coffee.get_description
+        return self._description
     
     def get_cost(self):
-        return self._coffee.get_cost()
+        return self._cost
     
 class ExtraShot(CoffeeDecorator):
-    def get_description(self):
-        return f"{self._coffee.get_description()} + Extra Shot"
-    
-    def get_cost(self):
-        return self._coffee.get_cost() + 10
+    def __init__(self, coffee: Coffee):
+        super().__init__(coffee)
+        self._description = f"{self._description} + Extra Shot"
+        self._cost += 10
     
 class SoyMilk(CoffeeDecorator):
     """Replaces regular milk with soy milk"""
     
-    def get_description(self) -> str:
-        return f"{self._coffee.get_description()} with Soy Milk"
-    
-    def get_cost(self) -> float:
-        return self._coffee.get_cost() + 0.50
+    def __init__(self, coffee: Coffee):
+        super().__init__(coffee)
+        self._description = f"{self._description} with Soy Milk"
+        self._cost += 0.50
 
 class VanillaSyrup(CoffeeDecorator):
     """Adds vanilla syrup"""
     
-    def get_description(self) -> str:
-        return f"{self._coffee.get_description()} + Vanilla Syrup"
-    
-    def get_cost(self) -> float:
-        return self._coffee.get_cost() + 0.40
+    def __init__(self, coffee: Coffee):
+        super().__init__(coffee)
+        self._description = f"{self._description} + Vanilla Syrup"
+        self._cost += 0.40
 
 class LargeSize(CoffeeDecorator):
     """Makes the coffee large size"""
     
-    def get_description(self) -> str:
-        return f"Large {self._coffee.get_description()}"
-    
-    def get_cost(self) -> float:
-        return self._coffee.get_cost() * 1.5
+    def __init__(self, coffee: Coffee):
+        super().__init__(coffee)
+        self._description = f"Large {self._description}"
+        self._cost *= 1.5
     
 class MachineStatus(Enum):
     ONLINE = "online"
@@ -84,7 +93,7 @@ class MachineStatus(Enum):
     MAINTENANCE = "maintenance"
     BUSY = "busy"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Order:
     order_id: str
     machine_id: str
@@ -93,7 +102,7 @@ class Order:
     timestamp: datetime
     processing_time: float = 0.0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MachineStats:
     machine_id: str
     total_orders: int
@@ -101,6 +110,9 @@ class MachineStats:
     average_processing_time: float
     status: MachineStatus
 
+# Order ids only need to be unique within this process, so a counter shared by all machines is enough
+_next_order_id = itertools.count(1).__next__
+
 # ================ INDIVIDUAL COFFEE MACHINE ================
 
 class CoffeeMachine:
@@ -109,12 +121,25 @@ class CoffeeMachine:
     def __init__(self, machine_id: str, location: str):
         self.machine_id = machine_id
         self.location = location
+        # Set by the owning CoffeeMakerService so it hears when the machine comes back online
+        self._online_listener: Optional[Callable[['CoffeeMachine'], None]] = None
         self.status = MachineStatus.ONLINE
         self.orders: List[Order] = []
         self.total_revenue = 0.0
+        self.total_processing_time = 0.0
         self.maintenance_counter = 0
         self.max_orders_before_maintenance = 50
     
+    @property
+    def status(self) -> MachineStatus:
+        return self._status
+    
+    @status.setter
+    def status(self, status: MachineStatus):
+        self._status = status
+        if status is MachineStatus.ONLINE and self._online_listener is not None:
+            self._online_listener(self)
+    
     def make_coffee(self, coffee: Coffee) -> Optional[Order]:
         """Make coffee and return order details"""
         if self.status != MachineStatus.ONLINE:
@@ -125,7 +150,7 @@ class CoffeeMachine:
         processing_time = random.uniform(1.0, 3.0)  # Simulate brewing time
         
         order = Order(
-            order_id=str(uuid.uuid4())[:8],
+            order_id=f"O{_next_order_id():08x}",
             machine_id=self.machine_id,
             coffee_description=coffee.get_description(),
             cost=coffee.get_cost(),
@@ -135,6 +160,7 @@ class CoffeeMachine:
         
         self.orders.append(order)
         self.total_revenue += order.cost
+        self.total_processing_time += processing_time
         self.maintenance_counter += 1
         
         # Check if maintenance needed
@@ -154,7 +180,7 @@ class CoffeeMachine:
     
     def get_stats(self) -> MachineStats:
         """Get machine statistics"""
-        avg_time = sum(o.processing_time for o in self.orders) / len(self.orders) if self.orders else 0
+        avg_time = self.total_processing_time / len(self.orders) if self.orders else 0
         return MachineStats(
             machine_id=self.machine_id,
             total_orders=len(self.orders),
@@ -175,21 +201,46 @@ class CoffeeMakerService:
     def __init__(self):
         self.machines: Dict[str, CoffeeMachine] = {}
         self.all_orders: List[Order] = []
+        self._total_revenue = 0.0  # Sum of all_orders' costs
+        # (order count, machine_id) for available machines; stale entries are skipped when popped
+        self._load_heap: List[Tuple[int, str]] = []
+        # Machines dropped from the heap while unavailable; _machine_online re-pushes them
+        # when their status returns to ONLINE, including changes made directly on the CoffeeMachine
+        self._parked: Set[str] = set()
+        # machine_id -> (status, order count, rendered list_machines row); reused while both are unchanged
+        self._row_cache: Dict[str, Tuple[MachineStatus, int, str]] = {}
     
     def add_machine(self, machine_id: str, location: str) -> bool:
         """Add a new coffee machine to the service"""
         if machine_id in self.machines:
             return False
         
-        self.machines[machine_id] = CoffeeMachine(machine_id, location)
-        print(f"✅ Added machine {machine_id} at {location}")
+        machine = self.machines[machine_id] = CoffeeMachine(machine_id, location)
+        machine._online_listener = self._machine_online
+        self._push_load(machine)
+        _log.debug("✅ Added machine %s at %s", machine_id, location)
         return True
     
+    def add_machines_bulk(self, machines: List[Tuple[str, str]]) -> int:
+        """Add many (machine_id, location) pairs at once, skipping IDs already present; returns how many were added"""
+        new_machines: Dict[str, CoffeeMachine] = {}
+        for machine_id, location in machines:
+            if machine_id not in self.machines and machine_id not in new_machines:
+                machine = new_machines[machine_id] = CoffeeMachine(machine_id, location)
+                machine._online_listener = self._machine_online
+        self.machines.update(new_machines)
+        
+        # New machines start with no orders; rebuild the load heap once rather than pushing each
+        self._rebuild_load_heap()
+        return len(new_machines)
+    
     def remove_machine(self, machine_id: str) -> bool:
         """Remove a coffee machine from service"""
         if machine_id in self.machines:
-            del self.machines[machine_id]
-            print(f"❌ Removed machine {machine_id}")
+            self.machines.pop(machine_id)._online_listener = None
+            self._parked.discard(machine_id)
+            self._row_cache.pop(machine_id, None)
+            _log.debug("❌ Removed machine %s", machine_id)
             return True
         return False
     
@@ -201,24 +252,69 @@ class CoffeeMakerService:
             machine = self.machines[preferred_machine_id]
             if machine.is_available():
                 order = machine.make_coffee(coffee)
+                self._push_load(machine)
                 if order:
                     self.all_orders.append(order)
+                    self._total_revenue += order.cost
                     return order
         
         # Use load balancing - find least busy available machine
-        available_machines = [m for m in self.machines.values() if m.is_available()]
+        best_machine = self._least_loaded_machine()
         
-        if not available_machines:
+        if not best_machine:
             return None  # No machines available
         
-        # Simple load balancing: choose machine with fewest orders
-        best_machine = min(available_machines, key=lambda m: len(m.orders))
-        
         order = best_machine.make_coffee(coffee)
+        self._push_load(best_machine)
         if order:
             self.all_orders.append(order)
+            self._total_revenue += order.cost
         
         return order
+
+    def _push_load(self, machine: CoffeeMachine):
+        if len(self._load_heap) > 2 * len(self.machines):
+            # Mostly stale entries by now; rebuild with one entry per available machine
+            self._rebuild_load_heap()
+        elif machine.is_available():
+            heapq.heappush(self._load_heap, (len(machine.orders), machine.machine_id))
+        else:
+            self._parked.add(machine.machine_id)
+
+    def _rebuild_load_heap(self):
+        self._load_heap = []
+        self._parked = set()
+        for mid, m in self.machines.items():
+            if m.is_available():
+                self._load_heap.append((len(m.orders), mid))
+            else:
+                self._parked.add(mid)
+        heapq.heapify(self._load_heap)
+
+    def _machine_online(self, machine: CoffeeMachine):
+        """Status hook: put a parked machine back in the load heap"""
+        if machine.machine_id in self._parked:
+            self._parked.discard(machine.machine_id)
+            heapq.heappush(self._load_heap, (len(machine.orders), machine.machine_id))
+
+    def _least_loaded_machine(self) -> Optional[CoffeeMachine]:
+        """Available machine with the fewest orders"""
+        heap = self._load_heap
+        while heap:
+            order_count, machine_id = heap[0]
+            machine = self.machines.get(machine_id)
+            # Skip entries for removed machines, unavailable machines, or outdated order counts
+            if machine and machine.is_available() and order_count == len(machine.orders):
+                return machine
+            heapq.heappop(heap)
+            if machine is None:
+                continue
+            if machine.is_available():
+                # Orders placed directly on the machine bypass _push_load; requeue at its real count
+                heapq.heappush(heap, (len(machine.orders), machine_id))
+            else:
+                self._parked.add(machine_id)
+        return None
     
     def get_available_machines(self) -> List[str]:
         """Get list of available machine IDs"""
@@ -233,12 +329,12 @@ class CoffeeMakerService:
     def get_service_stats(self) -> Dict:
         """Get overall service statistics"""
         total_orders = len(self.all_orders)
-        total_revenue = sum(order.cost for order in self.all_orders)
-        
-        machine_stats = [machine.get_stats() for machine in self.machines.values()]
+        total_revenue = self._total_revenue
         
-        online_machines = sum(1 for m in machine_stats if m.status == MachineStatus.ONLINE)
-        maintenance_machines = sum(1 for m in machine_stats if m.status == MachineStatus.MAINTENANCE)
+        # Only statuses are needed, so read them directly rather than building MachineStats
+        statuses = [machine.status for machine in self.machines.values()]
+        online_machines = statuses.count(MachineStatus.ONLINE)
+        maintenance_machines = statuses.count(MachineStatus.MAINTENANCE)
         
         return {
             "total_machines": len(self.machines),
@@ -253,7 +349,8 @@ class CoffeeMakerService:
         """Perform maintenance on specific machine"""
         if machine_id in self.machines:
             self.machines[machine_id].perform_maintenance()
-            print(f"🔧 Performed maintenance on machine {machine_id}")
+            self._push_load(self.machines[machine_id])
+            _log.debug("🔧 Performed maintenance on machine %s", machine_id)
             return True
         return False
     
@@ -261,7 +358,17 @@ class CoffeeMakerService:
         """List all machines with their status"""
         print("\n=== Coffee Machine Fleet ===")
         for machine in self.machines.values():
-            stats = machine.get_stats()
-            print(f"🤖 {machine.machine_id} ({machine.location}): "
-                  f"{stats.status.value} | Orders: {stats.total_orders} | "
-                  f"Revenue: ${stats.total_revenue:.2f}")
\ No newline at end of file
+            print(self._render_row(machine))
+
+    def _render_row(self, machine: CoffeeMachine) -> str:
+        # Revenue only changes with the order count, so status and count identify the row
+        order_count = len(machine.orders)
+        cached = self._row_cache.get(machine.machine_id)
+        if cached and cached[0] is machine.status and cached[1] == order_count:
+            return cached[2]
+        
+        row = (f"🤖 {machine.machine_id} ({machine.location}): "
+               f"{machine.status.value} | Orders: {order_count} | "
+               f"Revenue: ${machine.total_revenue:.2f}")
+        self._row_cache[machine.machine_id] = (machine.status, order_count, row)
+        return row
\ No newline at end of file
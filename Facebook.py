@@ -1,6 +1,15 @@
 from datetime import datetime
-from typing import List, Dict, Optional, Set
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from enum import Enum
+from collections import deque
+from itertools import islice
+from operator import attrgetter
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
 import uuid
 
 # Enums for better type safety
@@ -19,8 +28,23 @@ class NotificationType(Enum):
     POST_LIKE = "post_like"
     POST_COMMENT = "post_comment"
 
+_log = logging.getLogger(__name__)
+_now_ns = time.time_ns
+
 # Core Entity Classes
-class User:
+class _CreatedAt:
+    """Creation time is kept as epoch nanoseconds (cheap to store and compare);
+    created_at builds the datetime on demand"""
+    __slots__ = ()
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ns / 1_000_000_000)
+
+class User(_CreatedAt):
+    __slots__ = ('user_id', 'email', 'name', 'password', 'profile_picture', 'bio', 'created_at_ns',
+                 'is_active')
+
     def __init__(self, user_id: str, email: str, name: str, password: str):
         self.user_id = user_id
         self.email = email
@@ -28,7 +52,7 @@ class User:
         self.password = password  # In real system, this would be hashed
         self.profile_picture: Optional[str] = None
         self.bio: Optional[str] = None
-        self.created_at = datetime.now()
+        self.created_at_ns = _now_ns()
         self.is_active = True
         
     def update_profile(self, name: str = None, bio: str = None, profile_picture: str = None):
@@ -39,13 +63,16 @@ class User:
         if profile_picture:
             self.profile_picture = profile_picture
 
-class Post:
+class Post(_CreatedAt):
+    __slots__ = ('post_id', 'author_id', 'content', 'post_type', 'created_at_ns', 'updated_at',
+                 'is_active', 'privacy_level')
+
     def __init__(self, post_id: str, author_id: str, content: str, post_type: PostType):
         self.post_id = post_id
         self.author_id = author_id
         self.content = content
         self.post_type = post_type
-        self.created_at = datetime.now()
+        self.created_at_ns = _now_ns()
         self.updated_at = datetime.now()
         self.is_active = True
         self.privacy_level = "public"  # public, friends, private
@@ -54,29 +81,35 @@ class Post:
         self.content = content
         self.updated_at = datetime.now()
 
-class Comment:
+class Comment(_CreatedAt):
+    __slots__ = ('comment_id', 'post_id', 'author_id', 'content', 'created_at_ns', 'is_active')
+
     def __init__(self, comment_id: str, post_id: str, author_id: str, content: str):
         self.comment_id = comment_id
         self.post_id = post_id
         self.author_id = author_id
         self.content = content
-        self.created_at = datetime.now()
+        self.created_at_ns = _now_ns()
         self.is_active = True
 
-class Like:
+class Like(_CreatedAt):
+    __slots__ = ('like_id', 'post_id', 'user_id', 'created_at_ns')
+
     def __init__(self, like_id: str, post_id: str, user_id: str):
         self.like_id = like_id
         self.post_id = post_id
         self.user_id = user_id
-        self.created_at = datetime.now()
+        self.created_at_ns = _now_ns()
+
+class Friendship(_CreatedAt):
+    __slots__ = ('friendship_id', 'requester_id', 'receiver_id', 'status', 'created_at_ns', 'updated_at')
 
-class Friendship:
     def __init__(self, friendship_id: str, requester_id: str, receiver_id: str):
         self.friendship_id = friendship_id
         self.requester_id = requester_id
         self.receiver_id = receiver_id
         self.status = FriendshipStatus.PENDING
-        self.created_at = datetime.now()
+        self.created_at_ns = _now_ns()
         self.updated_at = datetime.now()
         
     def accept(self):
@@ -87,23 +120,62 @@ class Friendship:
         self.status = FriendshipStatus.BLOCKED
         self.updated_at = datetime.now()
 
-class Notification:
+class Notification(_CreatedAt):
+    __slots__ = ('notification_id', 'user_id', 'message', 'notification_type', 'is_read',
+                 'created_at_ns')
+
     def __init__(self, notification_id: str, user_id: str, message: str, notification_type: NotificationType):
         self.notification_id = notification_id
         self.user_id = user_id
         self.message = message
         self.notification_type = notification_type
         self.is_read = False
-        self.created_at = datetime.now()
+        self.created_at_ns = _now_ns()
         
     def mark_as_read(self):
         self.is_read = True
 
+class Trie:
+    """Suffix trie for substring search: every suffix of an indexed string is inserted,
+    so any substring is a prefix of some suffix. Each node holds the ids below it."""
+    __slots__ = ('children', 'user_ids')
+
+    def __init__(self):
+        self.children: Dict[str, 'Trie'] = {}
+        self.user_ids: Set[str] = set()
+
+    def add(self, text: str, user_id: str):
+        for start in range(len(text)):
+            node = self
+            for ch in text[start:]:
+                node = node.children.setdefault(ch, Trie())
+                node.user_ids.add(user_id)
+
+    def remove(self, text: str, user_id: str):
+        for start in range(len(text)):
+            node = self
+            for ch in text[start:]:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+                node.user_ids.discard(user_id)
+
+    def find(self, query: str) -> Set[str]:
+        node = self
+        for ch in query:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.user_ids
+
 # Service Layer Classes
 class UserService:
     def __init__(self):
         self.users: Dict[str, User] = {}
         self.email_to_user_id: Dict[str, str] = {}
+        self.search_index = Trie()  # Lowercased names and emails
+        self._registration_seq: Dict[str, int] = {}  # user_id -> registration order
+        self._seq_counter = itertools.count()
         
     def create_user(self, email: str, name: str, password: str) -> User:
         if email in self.email_to_user_id:
@@ -112,9 +184,25 @@ class UserService:
         user_id = str(uuid.uuid4())
         user = User(user_id, email, name, password)
         self.users[user_id] = user
+        self._registration_seq[user_id] = next(self._seq_counter)
         self.email_to_user_id[email] = user_id
+        self.search_index.add(name.lower(), user_id)
+        self.search_index.add(email.lower(), user_id)
         return user
         
+    def update_profile(self, user_id: str, name: str = None, bio: str = None, profile_picture: str = None) -> bool:
+        """Update a user's profile, keeping the search index in step with name changes"""
+        user = self.users.get(user_id)
+        if not user:
+            return False
+        if name:
+            self.search_index.remove(user.name.lower(), user_id)
+            self.search_index.add(name.lower(), user_id)
+            # The email shares the index; put back anything the old name's removal cleared
+            self.search_index.add(user.email.lower(), user_id)
+        user.update_profile(name, bio, profile_picture)
+        return True
+        
     def get_user(self, user_id: str) -> Optional[User]:
         return self.users.get(user_id)
         
@@ -127,21 +215,22 @@ class UserService:
         return None
         
     def search_users(self, query: str) -> List[User]:
-        results = []
         query_lower = query.lower()
-        for user in self.users.values():
-            if (query_lower in user.name.lower() or 
-                query_lower in user.email.lower()) and user.is_active:
-                results.append(user)
-        return results
+        if not query_lower:
+            # Empty string matches everyone; users is already in registration order
+            return [user for user in self.users.values() if user.is_active]
+        
+        user_ids = sorted(self.search_index.find(query_lower), key=self._registration_seq.__getitem__)
+        return [self.users[user_id] for user_id in user_ids if self.users[user_id].is_active]
 
 class PostService:
     def __init__(self):
         self.posts: Dict[str, Post] = {}
         self.user_posts: Dict[str, List[str]] = {}  # user_id -> list of post_ids
+        self._id_counter = itertools.count(1)  # Internal post ids
         
     def create_post(self, author_id: str, content: str, post_type: PostType) -> Post:
-        post_id = str(uuid.uuid4())
+        post_id = f"post-{next(self._id_counter)}"
         post = Post(post_id, author_id, content, post_type)
         
         self.posts[post_id] = post
@@ -158,6 +247,19 @@ class PostService:
         post_ids = self.user_posts.get(user_id, [])
         return [self.posts[post_id] for post_id in post_ids if self.posts[post_id].is_active]
         
+    def iter_recent_posts(self, user_id: str) -> Iterator[Post]:
+        """Yield a user's active posts, newest first, reading only as far as the caller does"""
+        # Post ids are appended in creation order, so the newest are at the end
+        posts = self.posts
+        for post_id in reversed(self.user_posts.get(user_id, ())):
+            post = posts[post_id]
+            if post.is_active:
+                yield post
+        
+    def get_recent_posts(self, user_id: str, k: int) -> List[Post]:
+        """A user's k most recent active posts, newest first"""
+        return list(islice(self.iter_recent_posts(user_id), k))
+        
     def delete_post(self, post_id: str, user_id: str) -> bool:
         post = self.posts.get(post_id)
         if post and post.author_id == user_id:
@@ -169,9 +271,10 @@ class CommentService:
     def __init__(self):
         self.comments: Dict[str, Comment] = {}
         self.post_comments: Dict[str, List[str]] = {}  # post_id -> list of comment_ids
+        self._id_counter = itertools.count(1)  # Internal comment ids
         
     def add_comment(self, post_id: str, author_id: str, content: str) -> Comment:
-        comment_id = str(uuid.uuid4())
+        comment_id = f"comment-{next(self._id_counter)}"
         comment = Comment(comment_id, post_id, author_id, content)
         
         self.comments[comment_id] = comment
@@ -186,70 +289,64 @@ class CommentService:
         return [self.comments[cid] for cid in comment_ids if self.comments[cid].is_active]
 
 class LikeService:
+    # A like is just a (post, user) edge; the two adjacency sets below are the whole record
     def __init__(self):
-        self.likes: Dict[str, Like] = {}
         self.post_likes: Dict[str, Set[str]] = {}  # post_id -> set of user_ids
         self.user_likes: Dict[str, Set[str]] = {}  # user_id -> set of post_ids
+        self.post_like_count: Dict[str, int] = {}  # post_id -> likes, independent of how edges are stored
         
-    def add_like(self, post_id: str, user_id: str) -> Optional[Like]:
-        if post_id in self.post_likes and user_id in self.post_likes[post_id]:
-            return None  # Already liked
-            
-        like_id = str(uuid.uuid4())
-        like = Like(like_id, post_id, user_id)
-        
-        self.likes[like_id] = like
-        
-        if post_id not in self.post_likes:
-            self.post_likes[post_id] = set()
-        self.post_likes[post_id].add(user_id)
-        
-        if user_id not in self.user_likes:
-            self.user_likes[user_id] = set()
-        self.user_likes[user_id].add(post_id)
+    def add_like(self, post_id: str, user_id: str) -> bool:
+        likers = self.post_likes.setdefault(post_id, set())
+        if user_id in likers:
+            return False  # Already liked
         
-        return like
+        likers.add(user_id)
+        self.user_likes.setdefault(user_id, set()).add(post_id)
+        self.post_like_count[post_id] = self.post_like_count.get(post_id, 0) + 1
+        return True
         
     def remove_like(self, post_id: str, user_id: str) -> bool:
         if (post_id in self.post_likes and user_id in self.post_likes[post_id]):
             self.post_likes[post_id].remove(user_id)
             self.user_likes[user_id].remove(post_id)
+            self.post_like_count[post_id] -= 1
             return True
         return False
         
     def get_post_like_count(self, post_id: str) -> int:
-        return len(self.post_likes.get(post_id, set()))
+        return self.post_like_count.get(post_id, 0)
         
     def has_user_liked_post(self, post_id: str, user_id: str) -> bool:
         return post_id in self.post_likes and user_id in self.post_likes[post_id]
 
 class FriendshipService:
     def __init__(self):
+        # One entry per pair of users, keyed by the pair's canonical id (see _pair_id)
         self.friendships: Dict[str, Friendship] = {}
-        self.user_friendships: Dict[str, Dict[str, str]] = {}  # user_id -> {friend_id: friendship_id}
+        # user_id -> ids of users they have a friendship with, as an ordered set in the order friendships were made
+        self.user_friendships: Dict[str, Dict[str, None]] = {}
+        
+    @staticmethod
+    def _pair_id(user1_id: str, user2_id: str) -> str:
+        """Same id whichever user comes first"""
+        return f"{user1_id}:{user2_id}" if user1_id < user2_id else f"{user2_id}:{user1_id}"
         
     def send_friend_request(self, requester_id: str, receiver_id: str) -> Optional[Friendship]:
         if requester_id == receiver_id:
             return None
             
         # Check if friendship already exists
-        if (requester_id in self.user_friendships and 
-            receiver_id in self.user_friendships[requester_id]):
+        friendship_id = self._pair_id(requester_id, receiver_id)
+        if friendship_id in self.friendships:
             return None
             
-        friendship_id = str(uuid.uuid4())
         friendship = Friendship(friendship_id, requester_id, receiver_id)
         
         self.friendships[friendship_id] = friendship
         
-        # Update mappings for both users
-        if requester_id not in self.user_friendships:
-            self.user_friendships[requester_id] = {}
-        if receiver_id not in self.user_friendships:
-            self.user_friendships[receiver_id] = {}
-            
-        self.user_friendships[requester_id][receiver_id] = friendship_id
-        self.user_friendships[receiver_id][requester_id] = friendship_id
+        # Update adjacency for both users
+        self.user_friendships.setdefault(requester_id, {})[receiver_id] = None
+        self.user_friendships.setdefault(receiver_id, {})[requester_id] = None
         
         return friendship
         
@@ -261,40 +358,146 @@ class FriendshipService:
         return False
         
     def get_friends(self, user_id: str) -> List[str]:
-        friends = []
-        if user_id in self.user_friendships:
-            for friend_id, friendship_id in self.user_friendships[user_id].items():
-                friendship = self.friendships[friendship_id]
-                if friendship.status == FriendshipStatus.ACCEPTED:
-                    friends.append(friend_id)
-        return friends
+        friendships = self.friendships
+        pair_id = self._pair_id
+        return [friend_id for friend_id in self.user_friendships.get(user_id, ())
+                if friendships[pair_id(user_id, friend_id)].status == FriendshipStatus.ACCEPTED]
         
     def are_friends(self, user1_id: str, user2_id: str) -> bool:
-        if user1_id in self.user_friendships and user2_id in self.user_friendships[user1_id]:
-            friendship_id = self.user_friendships[user1_id][user2_id]
-            friendship = self.friendships[friendship_id]
-            return friendship.status == FriendshipStatus.ACCEPTED
-        return False
+        friendship = self.friendships.get(self._pair_id(user1_id, user2_id))
+        return friendship is not None and friendship.status == FriendshipStatus.ACCEPTED
 
 class FeedService:
+    FEED_SIZE = 500  # Post ids kept per materialized feed
+    FANOUT_BATCH = 64  # Max posts fanned out per worker pass
+    # One background worker, shared by every FeedService, so posting doesn't wait on every friend's feed
+    _fanout_queue: "queue.Queue[Tuple[FeedService, Post]]" = queue.Queue()
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+    
     def __init__(self, post_service: PostService, friendship_service: FriendshipService):
         self.post_service = post_service
         self.friendship_service = friendship_service
+        # user_id -> post ids from the user and their friends, newest first; filled as posts are made
+        self.user_feed: Dict[str, deque] = {}
+        self._feed_lock = threading.Lock()
+        
+    def fanout(self, post: Post):
+        """Add a new post to its author's feed now and queue it for every friend's feed"""
+        # The author sees their own post immediately; friends get it from the worker
+        with self._feed_lock:
+            self._insert(post.author_id, post)
+        
+        cls = type(self)
+        if cls._worker is None:
+            with cls._worker_lock:
+                if cls._worker is None:
+                    cls._worker = threading.Thread(target=cls._fanout_worker, daemon=True)
+                    cls._worker.start()
+        cls._fanout_queue.put((self, post))
+        
+    def flush(self):
+        """Block until every queued post has been fanned out"""
+        self._fanout_queue.join()
+        
+    @classmethod
+    def _fanout_worker(cls):
+        while True:
+            for _ in range(cls._fanout_next_batch()):
+                cls._fanout_queue.task_done()
+                
+    @classmethod
+    def _fanout_next_batch(cls) -> int:
+        """Wait for queued posts, fan out up to FANOUT_BATCH of them and return how many were taken.
+        Kept apart from the loop so no service stays referenced while the worker is idle."""
+        batch = [cls._fanout_queue.get()]
+        while len(batch) < cls.FANOUT_BATCH:
+            try:
+                batch.append(cls._fanout_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        by_service: Dict[FeedService, List[Post]] = {}
+        for service, post in batch:
+            by_service.setdefault(service, []).append(post)
+        for service, posts in by_service.items():
+            try:
+                service._fanout_batch(posts)
+            except Exception:
+                # Keep the worker alive; otherwise nothing drains the queue and flush() hangs
+                _log.exception("Feed fanout failed for a batch of %d posts", len(posts))
+        return len(batch)
+                    
+    def _fanout_batch(self, posts: List[Post]):
+        # Look up recipients outside the lock, then apply the whole batch under one acquisition
+        deliveries = [(friend_id, post) for post in posts
+                      for friend_id in self.friendship_service.get_friends(post.author_id)]
+        with self._feed_lock:
+            for user_id, post in deliveries:
+                self._insert(user_id, post)
+                
+    def _insert(self, user_id: str, post: Post):
+        """Place a post in a user's feed by creation time, skipping it if already there.
+        Caller holds _feed_lock."""
+        feed = self.user_feed.get(user_id)
+        if feed is None:
+            feed = self.user_feed[user_id] = deque(maxlen=self.FEED_SIZE)
+        
+        # Posts usually arrive newest, so this scan normally stops at the front
+        all_posts = self.post_service.posts
+        created = post.created_at_ns
+        i, n = 0, len(feed)
+        while i < n and all_posts[feed[i]].created_at_ns > created:
+            i += 1
+        j = i
+        while j < n and all_posts[feed[j]].created_at_ns == created:
+            if feed[j] == post.post_id:
+                return  # Already delivered, e.g. by a rebuild
+            j += 1
+        
+        if n == self.FEED_SIZE:
+            if i == n:
+                return  # Older than everything kept
+            feed.pop()  # Make room by dropping the oldest
+        feed.insert(i, post.post_id)
+            
+    def rebuild_feed(self, user_id: str):
+        """Rebuild a user's feed from scratch, e.g. after their friend list changes"""
+        # Pull and replace under the lock so no delivery lands in between; posts still
+        # queued for the worker are skipped by _insert when they arrive
+        with self._feed_lock:
+            posts = self._pull_feed(user_id, self.FEED_SIZE)
+            self.user_feed[user_id] = deque((post.post_id for post in posts), maxlen=self.FEED_SIZE)
         
     def get_user_feed(self, user_id: str, limit: int = 20) -> List[Post]:
+        posts = []
+        all_posts = self.post_service.posts
+        with self._feed_lock:
+            feed = self.user_feed.get(user_id)
+            if feed is None:
+                return []
+            
+            for post_id in feed:
+                post = all_posts[post_id]
+                if post.is_active:
+                    posts.append(post)
+                    if len(posts) == limit:
+                        return posts
+            if len(feed) < self.FEED_SIZE:
+                return posts  # Nothing has been trimmed, so this is the whole feed
+        
+        # Older posts fell off the materialized feed; compute it from friends' posts
+        return self._pull_feed(user_id, limit)
+        
+    def _pull_feed(self, user_id: str, limit: int) -> List[Post]:
         # Get user's friends
         friends = self.friendship_service.get_friends(user_id)
         friends.append(user_id)  # Include user's own posts
         
-        # Collect all posts from friends
-        all_posts = []
-        for friend_id in friends:
-            friend_posts = self.post_service.get_user_posts(friend_id)
-            all_posts.extend(friend_posts)
-            
-        # Sort by creation time (newest first) and limit
-        all_posts.sort(key=lambda x: x.created_at, reverse=True)
-        return all_posts[:limit]
+        # Merge each user's newest-first posts and stop after limit instead of sorting everything
+        streams = [self.post_service.iter_recent_posts(friend_id) for friend_id in friends]
+        merged = heapq.merge(*streams, key=attrgetter('created_at_ns'), reverse=True)
+        return list(islice(merged, limit))
 
 # Main Facebook System Class
 class FacebookSystem:
@@ -315,11 +518,12 @@ class FacebookSystem:
         
     # Post operations
     def create_post(self, user_id: str, content: str, post_type: PostType = PostType.TEXT) -> Post:
-        return self.post_service.create_post(user_id, content, post_type)
+        post = self.post_service.create_post(user_id, content, post_type)
+        self.feed_service.fanout(post)
+        return post
         
     def like_post(self, post_id: str, user_id: str) -> bool:
-        like = self.like_service.add_like(post_id, user_id)
-        return like is not None
+        return self.like_service.add_like(post_id, user_id)
         
     def unlike_post(self, post_id: str, user_id: str) -> bool:
         return self.like_service.remove_like(post_id, user_id)
@@ -333,7 +537,13 @@ class FacebookSystem:
         return friendship is not None
         
     def accept_friend_request(self, friendship_id: str, user_id: str) -> bool:
-        return self.friendship_service.accept_friend_request(friendship_id, user_id)
+        if not self.friendship_service.accept_friend_request(friendship_id, user_id):
+            return False
+        # Both users now see each other's existing posts
+        friendship = self.friendship_service.friendships[friendship_id]
+        self.feed_service.rebuild_feed(friendship.requester_id)
+        self.feed_service.rebuild_feed(friendship.receiver_id)
+        return True
         
     # Feed operations
     def get_user_feed(self, user_id: str, limit: int = 20) -> List[Post]:
@@ -1,7 +1,10 @@
 from enum import Enum
 from datetime import datetime, date
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
+from collections import defaultdict
+import bisect
+import itertools
 import uuid
 
 class RoomType(Enum):
@@ -51,10 +54,23 @@ class Room:
         self.room_status = RoomStatus.AVAILABLE
         self.price_per_night = price_per_night
         self.features: List[str] = []
+        # Booked (check_in, check_out) stays, sorted and non-overlapping
+        self.booked_intervals: List[Tuple[date, date]] = []
 
     def is_available(self, check_in: date, check_out:date):
-        #TODO we need to check against the DB for the check in and out date
-        return self.room_status == RoomStatus.AVAILABLE
+        if self.room_status == RoomStatus.MAINTENANCE:
+            return False
+        # Stays are sorted and disjoint, so only the last one starting before check_out can overlap
+        i = bisect.bisect_left(self.booked_intervals, (check_out,))
+        return i == 0 or self.booked_intervals[i - 1][1] <= check_in
+    
+    def reserve(self, check_in: date, check_out: date):
+        bisect.insort(self.booked_intervals, (check_in, check_out))
+    
+    def release(self, check_in: date, check_out: date):
+        i = bisect.bisect_left(self.booked_intervals, (check_in, check_out))
+        if i < len(self.booked_intervals) and self.booked_intervals[i] == (check_in, check_out):
+            del self.booked_intervals[i]
     
     def add_features(self, feature: str):
         self.features.append(feature)
@@ -80,8 +96,9 @@ class Booking:
         self.status = BookingStatus.CANCELLED
         # Release rooms
         for room in self.rooms:
-            if room.status == RoomStatus.RESERVED:
-                room.status = RoomStatus.AVAILABLE
+            room.release(self.check_in_date, self.check_out_date)
+            if room.room_status == RoomStatus.RESERVED:
+                room.room_status = RoomStatus.AVAILABLE
 
 class Payment:
     def __init__(self, payment_id: str, booking: Booking, amount: float):
@@ -106,28 +123,31 @@ class RoomService:
     def __init__(self):
         #Room according to the room number
         self.rooms: Dict[str, Room] = {}
+        self.rooms_by_type: Dict[RoomType, List[Room]] = defaultdict(list)
     
     def add_room(self, room: Room):
+        previous = self.rooms.get(room.room_number)
+        if previous is not None:
+            self.rooms_by_type[previous.room_type].remove(previous)
         self.rooms[room.room_number] = room
+        self.rooms_by_type[room.room_type].append(room)
     
     def get_available_rooms(self, room_type: RoomType, check_in: date, check_out: date) -> List[Room]:
-        available_rooms = []
-        for room in self.rooms.values():
-            if (room.room_type == room_type and room.is_available(check_in, check_out)):
-                available_rooms.append(room)
-        return available_rooms
+        # Only rooms of the requested type are checked
+        return [room for room in self.rooms_by_type.get(room_type, ())
+                if room.is_available(check_in, check_out)]
     
     def get_room(self, room_number: str) -> Optional[Room]:
         return self.rooms.get(room_number)
     
     def update_room_status(self, room_number: str, status: RoomStatus):
         if room_number in self.rooms:
-            self.rooms[room_number].status = status
+            self.rooms[room_number].room_status = status
 
 class BookingService:
     def __init__(self, room_service: RoomService):
         self.bookings: Dict[str, Booking] = {}
-        self.room_servoce = room_service
+        self.room_service = room_service
 
     def create_booking(self, guest: Guest, room_numbers: List[str], check_in_date: date, check_out_date: date) -> Optional[Booking]:
         if check_in_date >= check_out_date or check_in_date < date.today():
@@ -144,7 +164,8 @@ class BookingService:
         booking = Booking(booking_id, guest, rooms, check_in_date, check_out_date)
 
         for room in rooms:
-            room.status = RoomStatus.RESERVED
+            room.reserve(check_in_date, check_out_date)
+            room.room_status = RoomStatus.RESERVED
         
         self.bookings[booking_id] = booking
         guest.bookings.append(booking)
@@ -166,7 +187,7 @@ class BookingService:
         if booking and booking.status == BookingStatus.CONFIRMED:
             booking.status = BookingStatus.CHECKED_IN
             for room in booking.rooms:
-                room.status = RoomStatus.OCCUPIED
+                room.room_status = RoomStatus.OCCUPIED
             return True
         return False
 
@@ -175,28 +196,38 @@ class BookingService:
         if booking and booking.status == BookingStatus.CHECKED_IN:
             booking.status = BookingStatus.CHECKED_OUT
             for room in booking.rooms:
-                room.status = RoomStatus.AVAILABLE
+                room.release(booking.check_in_date, booking.check_out_date)
+                room.room_status = RoomStatus.AVAILABLE
             return True
         return False
     
 class GuestService:
     def __init__(self):
         self.guests: Dict[str, Guest] = {}
+        self.email_to_guest_id: Dict[str, str] = {}  # Normalized email -> guest_id
+        self._id_counter = itertools.count(1)  # Internal guest ids
     
     def register_guest(self, name: str, email: str, phone: str, address: Address) -> Guest:
-        guest_id = str(uuid.uuid4())
+        email_key = self._normalize_email(email)
+        if email_key in self.email_to_guest_id:
+            raise ValueError("Guest with this email already exists")
+        
+        guest_id = f"guest-{next(self._id_counter)}"
         guest = Guest(guest_id, name, email, phone, address)
         self.guests[guest_id] = guest
+        self.email_to_guest_id[email_key] = guest_id
         return guest
     
     def get_guest(self, guest_id: str) -> Optional[Guest]:
         return self.guests.get(guest_id)
     
     def find_guest_by_email(self, email: str) -> Optional[Guest]:
-        for guest in self.guests.values():
-            if guest.email == email:
-                return guest
-        return None
+        guest_id = self.email_to_guest_id.get(self._normalize_email(email))
+        return self.guests.get(guest_id) if guest_id else None
+    
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        return email.strip().lower()
 
 class HotelManagementSystem:
     def __init__(self, hotel_name: str):